@@ -0,0 +1,66 @@
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+
+from country_data import scope_map
+from geo_assets import load_manifest
+
+###############################################################################
+# 1) PŘEDPŘIPRAVENÝ ARTEFAKT SE ZÁKLADNÍMI FIGURAMI
+###############################################################################
+# `python artifacts.py build` při nasazení uloží serializované základní figury všech
+# kontinentů; server je pak při startu jen načte z JSON a nepotřebuje plotly.
+ARTIFACT_PATH = os.environ.get(
+    "QUIZ_ARTIFACT", os.path.join(os.path.dirname(os.path.abspath(__file__)), "build", "figures.json")
+)
+# Zvýšit při každé změně map_figures.build_base_figure - starší artefakt se pak nepoužije
+FIGURE_FORMAT = 3
+
+
+def data_fingerprint(data):
+    # Artefakt platí jen pro stejný formát figur, verzi dat zemí (otisk souboru) a lokální GeoJSON
+    payload = json.dumps([FIGURE_FORMAT, data.version, scope_map, load_manifest()], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _read_artifact(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_prebuilt_figures(data):
+    artifact = _read_artifact(ARTIFACT_PATH)
+    if artifact is None or artifact.get("fingerprint") != data_fingerprint(data):
+        # Chybějící nebo zastaralý artefakt (jiná verze dat) -> figury se postaví za běhu
+        return None
+    return artifact
+
+###############################################################################
+# 2) BUILD
+###############################################################################
+def build(path=ARTIFACT_PATH):
+    from country_index import current
+    from map_figures import _to_plain, build_base_figure, build_placeholder_figure
+
+    data = current()
+    artifact = {
+        "fingerprint": data_fingerprint(data),
+        "base": {cont: _to_plain(build_base_figure(cont, data)) for cont in data.names_by_continent},
+        "placeholder": _to_plain(build_placeholder_figure()),
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, separators=(",", ":"), ensure_ascii=False)
+    _read_artifact.cache_clear()
+    return path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        sys.exit("Usage: python artifacts.py build [path]")
+    print(build(*sys.argv[2:3]))
@@ -0,0 +1,22 @@
+from a2wsgi import WSGIMiddleware
+from fastapi import FastAPI
+
+from wsgi import application as wsgi_application
+
+###############################################################################
+# ASGI VSTUP (uvicorn asgi:application --workers N)
+###############################################################################
+# Uvicorn nemá preload: každý worker importuje aplikaci sám (vlastní předpočítané
+# figury, žádné sdílení copy-on-write jako u gunicorn). Session jsou s více workery
+# automaticky ve sdíleném SQLite (session_store.default_backend_spec).
+application = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+
+
+@application.get("/healthz")
+def healthz():
+    # Odpovídá přímo z ASGI vrstvy, bez průchodu přes Flask/Dash
+    return {"status": "ok"}
+
+
+# Všechno ostatní (Dash layout, callbacky, assety) obsluhuje Flask aplikace
+application.mount("/", WSGIMiddleware(wsgi_application))
@@ -0,0 +1,82 @@
+// Clientside callbacky kvízu: skóre, čas, seznamy a volby dropdownu se počítají
+// v prohlížeči ze "store-progress" a "store-countries" - bez dotazu na server.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    quiz: {
+        // Bit i bitmasky "done" (base64, little-endian) = země s ID i je hotová
+        _isDone: function (bytes, id) {
+            return ((bytes.charCodeAt(id >> 3) || 0) >> (id & 7)) & 1;
+        },
+
+        _split: function (progress, countries) {
+            var ids = countries.continents[progress.continent] || countries.continents["Alle"];
+            var bytes = atob(progress.done || "");
+            var remaining = [], done = [];
+            for (var i = 0; i < ids.length; i++) {
+                (window.dash_clientside.quiz._isDone(bytes, ids[i]) ? done : remaining).push(ids[i]);
+            }
+            return {remaining: remaining, done: done};
+        },
+
+        dropdownOptions: function (progress, countries) {
+            if (!progress) {
+                return window.dash_clientside.no_update;
+            }
+            if (progress.input === "click") {
+                return [];
+            }
+            // Režim "capital" popisuje volby hlavními městy, odpovědí je ale vždy ID země
+            var labels = progress.labels === "capitals" ? countries.capitals : countries.names;
+            return window.dash_clientside.quiz._split(progress, countries).remaining.filter(function (id) {
+                return labels[id];
+            }).map(function (id) {
+                return {label: labels[id], value: id};
+            });
+        },
+
+        answerControls: function (progress) {
+            if (!progress) {
+                return window.dash_clientside.no_update;
+            }
+            return progress.input === "click" ? {display: "none"} : {};
+        },
+
+        renderScore: function (progress) {
+            if (!progress) {
+                return [window.dash_clientside.no_update, window.dash_clientside.no_update];
+            }
+            return [String(progress.correct), String(progress.wrong)];
+        },
+
+        renderTimer: function (nIntervals, progress) {
+            var quiz = window.dash_clientside.quiz;
+            if (!progress || progress.start === null) {
+                return window.dash_clientside.no_update;
+            }
+            // Čas serveru a prohlížeče se může lišit - posun změříme při příchodu nového stavu
+            if (quiz._seenNow !== progress.now) {
+                quiz._seenNow = progress.now;
+                quiz._offset = Date.now() / 1000 - progress.now;
+            }
+            var end = progress.end !== null ? progress.end : Date.now() / 1000 - quiz._offset;
+            var elapsed = Math.max(0, end - progress.start);
+            if (elapsed < 120) {
+                return Math.floor(elapsed) + " s";
+            }
+            return Math.floor(elapsed / 60) + " min " + Math.floor(elapsed % 60) + " s";
+        },
+
+        renderLists: function (progress, countries) {
+            if (!progress) {
+                return [window.dash_clientside.no_update, window.dash_clientside.no_update];
+            }
+            var split = window.dash_clientside.quiz._split(progress, countries);
+            var toNames = function (ids) {
+                return ids.map(function (id) { return countries.names[id]; }).join(", ");
+            };
+            return [
+                split.remaining.length ? toNames(split.remaining) : "Keine mehr",
+                split.done.length ? toNames(split.done) : "Noch keine"
+            ];
+        }
+    }
+});
@@ -0,0 +1,2 @@
+# Benchmarky callbacků kvízu: přímé volání funkcí i cesta přes /_dash-update-component.
+# Spuštění: python -m bench run --out base.json; python -m bench compare base.json new.json
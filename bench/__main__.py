@@ -0,0 +1,48 @@
+import argparse
+import sys
+
+from bench.runner import compare, load, run, save
+
+
+def _print_results(results):
+    print(f"{'callback':<28} {'calls':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'mean B':>9} {'max B':>8}")
+    for name, s in results["callbacks"].items():
+        print(f"{name:<28} {s['calls']:>6} {s['p50_ms']:>9.3f} {s['p90_ms']:>9.3f} {s['p99_ms']:>9.3f} "
+              f"{s['mean_bytes']:>9.1f} {s['max_bytes']:>8}")
+    for mode, kb in results["peak_memory_kb"].items():
+        print(f"peak memory ({mode}): {kb:.1f} kB, guesses: {results['guesses'][mode]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Benchmarks for the quiz callbacks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="play simulated games on every continent")
+    run_parser.add_argument("--games", type=int, default=3, help="games per continent")
+    run_parser.add_argument("--seed", type=int, default=1234)
+    run_parser.add_argument("--mode", choices=("engine", "direct", "http", "all"), default="all")
+    run_parser.add_argument("--out", help="write results as JSON")
+
+    cmp_parser = sub.add_parser("compare", help="compare two result files, exit 1 on regression")
+    cmp_parser.add_argument("base")
+    cmp_parser.add_argument("new")
+    cmp_parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        modes = ("engine", "direct", "http") if args.mode == "all" else (args.mode,)
+        results = run(games=args.games, seed=args.seed, modes=modes)
+        _print_results(results)
+        if args.out:
+            save(results, args.out)
+        return 0
+
+    rows, regressions = compare(load(args.base), load(args.new), threshold=args.threshold)
+    for name, metric, old, cur, change in rows:
+        flag = "  REGRESSION" if (name, metric, old, cur, change) in regressions else ""
+        print(f"{name:<28} {metric:<10} {old:>10.3f} -> {cur:>10.3f} ({change:+.1%}){flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+import copy
+import json
+import time
+
+###############################################################################
+# 1) MINIMÁLNÍ DASH KLIENT NAD FLASK TEST CLIENTEM
+###############################################################################
+# Simuluje renderer v prohlížeči: drží hodnoty props komponent, po změně propu
+# zavolá všechny serverové callbacky s tímto Inputem a výsledky řetězí dál.
+DASH_ENDPOINT = "/_dash-update-component"
+
+
+def _split_outputs(output):
+    parts = output[2:-2].split("...") if output.startswith("..") else [output]
+    return [tuple(part.rsplit(".", 1)) for part in parts]
+
+
+def apply_patch(value, patch):
+    # Podmnožina operací dash.Patch, kterou kvíz používá
+    value = copy.deepcopy(value)
+    for op in patch["operations"]:
+        location, params = op["location"], op["params"]
+        if not location:
+            target, key = None, None
+        else:
+            target = value
+            for step in location[:-1]:
+                if isinstance(target, dict):
+                    target = target.setdefault(step, {})
+                else:
+                    target = target[step]
+            key = location[-1]
+        name = op["operation"]
+        if name == "Assign":
+            if target is None:
+                value = params["value"]
+            else:
+                target[key] = params["value"]
+            continue
+        container = value if target is None else target[key]
+        if name == "Append":
+            container.append(params["value"])
+        elif name == "Extend":
+            container.extend(params["value"])
+        elif name == "Remove":
+            if params["value"] in container:
+                container.remove(params["value"])
+        elif name == "Merge":
+            container.update(params["value"])
+        elif name == "Delete":
+            del target[key]
+        else:
+            raise NotImplementedError(name)
+    return value
+
+
+def build_payload(callback, props, changed):
+    outputs = [{"id": cid, "property": prop} for cid, prop in _split_outputs(callback["output"])]
+    return {
+        "output": callback["output"],
+        "outputs": outputs if len(outputs) > 1 else outputs[0],
+        "inputs": [dict(i, value=props.get((i["id"], i["property"]))) for i in callback["inputs"]],
+        "state": [dict(s, value=props.get((s["id"], s["property"]))) for s in callback["state"]],
+        "changedPropIds": [changed],
+    }
+
+
+def triggered_callbacks(callbacks, prop_id):
+    return [c for c in callbacks if prop_id in [f"{i['id']}.{i['property']}" for i in c["inputs"]]]
+
+
+def apply_response(props, response_json):
+    # Zapíše výstupy callbacku do props a vrátí změněné prop_id pro další řetězení
+    changed = []
+    for component_id, values in response_json["response"].items():
+        for name, value in values.items():
+            if isinstance(value, dict) and "__dash_patch_update" in value:
+                value = apply_patch(props.get((component_id, name)), value)
+            props[(component_id, name)] = value
+            changed.append(f"{component_id}.{name}")
+    return changed
+
+
+def collect_props(layout):
+    props = {}
+
+    def walk(node):
+        if isinstance(node, list):
+            for child in node:
+                walk(child)
+        elif isinstance(node, dict) and "props" in node:
+            node_props = node["props"]
+            if "id" in node_props:
+                for name, value in node_props.items():
+                    props[(node_props["id"], name)] = value
+            walk(node_props.get("children"))
+
+    walk(layout)
+    return props
+
+
+def server_callbacks(dependencies):
+    return [d for d in dependencies if not d.get("clientside_function")]
+
+
+class DashClient:
+    def __init__(self, app, on_response=None):
+        self.app = app
+        self.http = app.server.test_client()
+        self.on_response = on_response      # on_response(callback_name, seconds, payload_bytes)
+        self.props = collect_props(self.http.get("/_dash-layout").get_json())
+        self.callbacks = server_callbacks(self.http.get("/_dash-dependencies").get_json())
+
+    def callback_name(self, output):
+        entry = self.app.callback_map.get(output)
+        return entry["callback"].__name__ if entry else output
+
+    def get(self, component_id, prop):
+        return self.props.get((component_id, prop))
+
+    def set(self, component_id, prop, value):
+        self.props[(component_id, prop)] = value
+        self._propagate([f"{component_id}.{prop}"])
+
+    def _propagate(self, changed):
+        queue = list(changed)
+        while queue:
+            prop_id = queue.pop(0)
+            for callback in triggered_callbacks(self.callbacks, prop_id):
+                body = json.dumps(build_payload(callback, self.props, prop_id))
+                start = time.perf_counter()
+                response = self.http.post(DASH_ENDPOINT, data=body, content_type="application/json")
+                elapsed = time.perf_counter() - start
+                if self.on_response:
+                    self.on_response(self.callback_name(callback["output"]), elapsed, len(response.data))
+                if response.status_code == 204:
+                    continue
+                if response.status_code != 200:
+                    raise RuntimeError(f"{callback['output']}: HTTP {response.status_code}: {response.data[:500]!r}")
+                queue.extend(apply_response(self.props, response.get_json()))
@@ -0,0 +1,404 @@
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from bench.dash_client import DASH_ENDPOINT, apply_response, build_payload, collect_props, server_callbacks, triggered_callbacks
+from bench.runner import percentile
+from bench.scenarios import _click_data, _pick_guess
+import country_index
+import game_engine
+
+try:
+    import httpx
+except ImportError:      # httpx je volitelný - jinak vlastní asyncio HTTP/1.1 klient
+    httpx = None
+
+try:
+    import psutil
+except ImportError:      # bez psutil se CPU/RSS serveru čte z /proc (Linux)
+    psutil = None
+
+###############################################################################
+# 1) ZÁTĚŽOVÝ TEST: TŘÍDA PLNÁ SOUBĚŽNÝCH HRÁČŮ
+###############################################################################
+# python -m bench.loadtest --players 30 --duration 60 [--url http://host:port] [--server gunicorn]
+# Bez --url se spustí lokální server v podprocesu, aby šlo měřit jeho CPU a RSS.
+
+###############################################################################
+# 2) HTTP KLIENT (httpx, nebo minimální asyncio klient s keep-alive)
+###############################################################################
+class _StreamConnection:
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.reader = self.writer = None
+
+    async def _open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+    async def request(self, method, path, body=None):
+        for attempt in (1, 2):
+            if self.writer is None:
+                await self._open()
+            try:
+                return await self._request(method, path, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if attempt == 2:
+                    raise
+
+    async def _request(self, method, path, body):
+        data = body or b""
+        head = (
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+            "Accept-Encoding: gzip\r\nConnection: keep-alive\r\n\r\n"
+        )
+        self.writer.write(head.encode("latin-1") + data)
+        await self.writer.drain()
+
+        status = int((await self.reader.readuntil(b"\r\n")).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in headers:
+            payload = await self.reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding") == "chunked":
+            payload = b""
+            while True:
+                size = int((await self.reader.readuntil(b"\r\n")).strip(), 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                payload += chunk[:-2]
+        else:
+            payload = await self.reader.read()
+            await self.close()
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+
+        wire_bytes = len(payload)
+        if headers.get("content-encoding") == "gzip":
+            payload = gzip.decompress(payload)
+        return status, payload, wire_bytes
+
+
+class _HttpxConnection:
+    def __init__(self, base_url):
+        self.client = httpx.AsyncClient(base_url=base_url, timeout=30.0)
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def request(self, method, path, body=None):
+        response = await self.client.request(
+            method, path, content=body, headers={"Content-Type": "application/json"}
+        )
+        wire_bytes = int(response.headers.get("content-length", len(response.content)))
+        return response.status_code, response.content, wire_bytes
+
+
+def _connect(base_url):
+    return _HttpxConnection(base_url) if httpx is not None else _StreamConnection(base_url)
+
+###############################################################################
+# 3) VIRTUÁLNÍ HRÁČ: OBRAZOVKY 1 -> 2 -> 3 A TIPY S DOBOU NA ROZMYŠLENOU
+###############################################################################
+class Stats:
+    def __init__(self):
+        self.requests = []      # (čas dokončení, callback, latence s, status, bajty)
+        self.errors = defaultdict(int)
+        self.games = 0
+        self.guesses = 0
+
+    def record(self, name, latency, status, size):
+        self.requests.append((time.time(), name, latency, status, size))
+
+
+class Player:
+    def __init__(self, base_url, stats, rng, think, accuracy=0.7):
+        self.conn = _connect(base_url)
+        self.stats = stats
+        self.rng = rng
+        self.think = think
+        self.accuracy = accuracy
+        self.props = {}
+        self.callbacks = []
+
+    async def _get_json(self, path):
+        start = time.perf_counter()
+        status, payload, size = await self.conn.request("GET", path)
+        self.stats.record(path, time.perf_counter() - start, status, size)
+        return json.loads(payload)
+
+    async def _pause(self):
+        # Doba na rozmyšlení: kolem `think` sekund, s rozptylem
+        await asyncio.sleep(self.think * self.rng.uniform(0.5, 1.5))
+
+    async def load_page(self):
+        start = time.perf_counter()
+        status, _, size = await self.conn.request("GET", "/")
+        self.stats.record("/", time.perf_counter() - start, status, size)
+        self.props = collect_props(await self._get_json("/_dash-layout"))
+        self.callbacks = server_callbacks(await self._get_json("/_dash-dependencies"))
+
+    async def set(self, component_id, prop, value):
+        self.props[(component_id, prop)] = value
+        queue = [f"{component_id}.{prop}"]
+        while queue:
+            prop_id = queue.pop(0)
+            for callback in triggered_callbacks(self.callbacks, prop_id):
+                name = callback["output"].strip(".").split("...")[0]
+                body = json.dumps(build_payload(callback, self.props, prop_id)).encode("utf-8")
+                start = time.perf_counter()
+                try:
+                    status, payload, size = await self.conn.request("POST", DASH_ENDPOINT, body)
+                except (OSError, asyncio.IncompleteReadError) as exc:
+                    self.stats.errors[type(exc).__name__] += 1
+                    self.stats.record(name, time.perf_counter() - start, 0, 0)
+                    continue
+                self.stats.record(name, time.perf_counter() - start, status, size)
+                if status == 200:
+                    queue.extend(apply_response(self.props, json.loads(payload)))
+                elif status != 204:
+                    self.stats.errors[f"HTTP {status}"] += 1
+
+    async def click(self, button_id):
+        await self.set(button_id, "n_clicks", (self.props.get((button_id, "n_clicks")) or 0) + 1)
+
+    async def play(self, deadline):
+        await self.load_page()
+        await self._pause()
+        await self.click("btn-to-screen-2")
+        while time.time() < deadline:
+            await self._pause()
+            data = country_index.get_or_current(self.props.get(("store-data-version", "data")))
+            await self.set("continent-dropdown", "value", self.rng.choice(data.continents + (country_index.ALL,)))
+            # Třída hraje všechny režimy - i odpovědi kliknutím do mapy
+            mode = self.rng.choice(tuple(game_engine.MODES))
+            self.props[("mode-select", "value")] = mode
+            self.props[("adaptive-select", "value")] = ["adaptive"] if self.rng.random() < 0.5 else []
+            by_click = game_engine.get_mode(mode).input == "click"
+            await self.click("btn-to-screen-3")
+            self.stats.games += 1
+            while self.props.get(("store-selected-country", "data")) and time.time() < deadline:
+                await self._pause()
+                current = data.id_by_de[self.props[("store-selected-country", "data")]]
+                progress = self.props.get(("store-progress", "data"))
+                guess_id = _pick_guess(self.rng, data, current, progress, self.accuracy)
+                if by_click:
+                    await self.set("blind-map", "clickData", _click_data(data, guess_id))
+                else:
+                    self.props[("country-guess-dropdown", "value")] = guess_id
+                    await self.click("guess-button")
+                self.stats.guesses += 1
+            await self.click("btn-back-to-screen-2")
+        await self.conn.close()
+
+###############################################################################
+# 4) CPU A RSS SERVERU (proces + potomci, např. gunicorn workeři)
+###############################################################################
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _process_tree(pid):
+    pids = [pid]
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+            except OSError:
+                continue
+            if int(fields[1]) == pid:
+                pids.append(int(entry))
+    return pids
+
+
+def _cpu_seconds_and_rss(pid):
+    if psutil is not None:
+        procs = [psutil.Process(pid)] + psutil.Process(pid).children(recursive=True)
+        cpu = sum(sum(p.cpu_times()[:2]) for p in procs)
+        return cpu, sum(p.memory_info().rss for p in procs)
+    cpu, rss = 0.0, 0
+    for child in _process_tree(pid):
+        try:
+            with open(f"/proc/{child}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{child}/statm") as f:
+                rss += int(f.read().split()[1]) * _PAGE_SIZE
+        except OSError:
+            continue
+        cpu += (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+    return cpu, rss
+
+
+async def sample_server(pid, samples, interval, stop):
+    last_cpu, last_time = _cpu_seconds_and_rss(pid)[0], time.time()
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        cpu, rss = _cpu_seconds_and_rss(pid)
+        now = time.time()
+        samples.append((now, 100.0 * (cpu - last_cpu) / (now - last_time), rss / 2 ** 20))
+        last_cpu, last_time = cpu, now
+
+###############################################################################
+# 5) SPUŠTĚNÍ SERVERU A REPORT
+###############################################################################
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(kind, port):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if kind == "gunicorn":
+        cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}",
+               "--access-logfile", "/dev/null", "wsgi:application"]
+    else:
+        cmd = [sys.executable, "-c",
+               f"from wsgi import application; application.run(host='127.0.0.1', port={port}, threaded=True, debug=False)"]
+    # Hry simulovaných hráčů se neukládají do výsledků (žebříček, váhy adaptivního výběru)
+    env = dict(os.environ, QUIZ_RESULTS_DB="off")
+    proc = subprocess.Popen(cmd, cwd=root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # Port může být otevřený dřív, než workery obslouží první request -> čekáme na HTTP 200
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=5) as response:
+                if response.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"Server did not start: {' '.join(cmd)}")
+
+
+def report(stats, samples, started, duration, bucket=5.0):
+    lines = []
+    total = len(stats.requests)
+    failed = sum(1 for r in stats.requests if r[3] not in (200, 204, 304))
+    latencies = [r[2] * 1000 for r in stats.requests]
+    lines.append(f"requests: {total}, throughput: {total / duration:.1f} req/s, "
+                 f"errors: {failed} ({100.0 * failed / total if total else 0:.2f} %)")
+    lines.append(f"games started: {stats.games}, guesses: {stats.guesses}")
+    lines.append(f"latency ms: p50 {percentile(latencies, 50):.1f}  p90 {percentile(latencies, 90):.1f}  "
+                 f"p99 {percentile(latencies, 99):.1f}  max {max(latencies, default=0):.1f}")
+    for kind, count in sorted(stats.errors.items()):
+        lines.append(f"  error {kind}: {count}")
+
+    lines.append("")
+    lines.append(f"{'endpoint / callback':<40} {'count':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'mean B':>8}")
+    by_name = defaultdict(list)
+    for _, name, latency, _, size in stats.requests:
+        by_name[name].append((latency * 1000, size))
+    for name, values in sorted(by_name.items()):
+        ms = [v[0] for v in values]
+        lines.append(f"{name[:40]:<40} {len(values):>7} {percentile(ms, 50):>8.1f} {percentile(ms, 90):>8.1f} "
+                     f"{percentile(ms, 99):>8.1f} {sum(v[1] for v in values) / len(values):>8.0f}")
+
+    lines.append("")
+    lines.append(f"{'t [s]':>6} {'req/s':>7} {'p90 ms':>8} {'cpu %':>7} {'rss MB':>7}")
+    t = 0.0
+    while t < duration:
+        window = [r for r in stats.requests if started + t <= r[0] < started + t + bucket]
+        window_samples = [s for s in samples if started + t <= s[0] < started + t + bucket]
+        cpu = max((s[1] for s in window_samples), default=0.0)
+        rss = max((s[2] for s in window_samples), default=0.0)
+        p90 = percentile([r[2] * 1000 for r in window], 90)
+        lines.append(f"{t:>6.0f} {len(window) / bucket:>7.1f} {p90:>8.1f} {cpu:>7.1f} {rss:>7.1f}")
+        t += bucket
+    return "\n".join(lines)
+
+
+async def run(base_url, players, duration, think, ramp, seed, server_pid=None):
+    stats = Stats()
+    samples = []
+    stop = asyncio.Event()
+    started = time.time()
+    deadline = started + duration
+    sampler = asyncio.create_task(sample_server(server_pid, samples, 1.0, stop)) if server_pid else None
+
+    async def delayed(i):
+        # Postupný nástup hráčů během `ramp` sekund
+        await asyncio.sleep(ramp * i / max(players, 1))
+        player = Player(base_url, stats, random.Random(seed + i), think)
+        try:
+            await player.play(deadline)
+        except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+            # Spadlé spojení nebo nevalidní odpověď ukončí jen tohoto hráče
+            stats.errors[f"player aborted: {type(exc).__name__}"] += 1
+            await player.conn.close()
+
+    await asyncio.gather(*(delayed(i) for i in range(players)))
+    stop.set()
+    if sampler:
+        await sampler
+    return stats, samples, started, time.time() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.loadtest", description="Classroom load test")
+    parser.add_argument("--players", type=int, default=30)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    parser.add_argument("--think", type=float, default=2.0, help="mean think time between actions (s)")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds until all players joined")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--url", help="existing server; default starts a local one")
+    parser.add_argument("--server", choices=("werkzeug", "gunicorn"), default="werkzeug")
+    parser.add_argument("--out", help="write raw request samples as JSON")
+    args = parser.parse_args(argv)
+
+    proc = None
+    base_url = args.url
+    if not base_url:
+        port = _free_port()
+        proc = start_server(args.server, port)
+        base_url = f"http://127.0.0.1:{port}"
+    try:
+        stats, samples, started, elapsed = asyncio.run(
+            run(base_url, args.players, args.duration, args.think, args.ramp, args.seed,
+                server_pid=proc.pid if proc else None)
+        )
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    print(f"target: {base_url}, players: {args.players}, duration: {elapsed:.1f} s, "
+          f"client: {'httpx' if httpx is not None else 'asyncio streams'}")
+    print(report(stats, samples, started, elapsed))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"requests": stats.requests, "server_samples": samples, "errors": dict(stats.errors)}, f)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
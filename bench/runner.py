@@ -0,0 +1,131 @@
+import gc
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+from collections import defaultdict
+
+from country_data import scope_map
+
+###############################################################################
+# 1) SBĚR MĚŘENÍ
+###############################################################################
+class Recorder:
+    def __init__(self, mode):
+        self.mode = mode
+        self.samples = defaultdict(lambda: {"seconds": [], "bytes": []})
+
+    def __call__(self, name, seconds, payload_bytes):
+        sample = self.samples[f"{self.mode}:{name}"]
+        sample["seconds"].append(seconds)
+        sample["bytes"].append(payload_bytes)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def summarize(samples):
+    summary = {}
+    for name, sample in sorted(samples.items()):
+        ms = [s * 1000 for s in sample["seconds"]]
+        summary[name] = {
+            "calls": len(ms),
+            "p50_ms": round(percentile(ms, 50), 4),
+            "p90_ms": round(percentile(ms, 90), 4),
+            "p99_ms": round(percentile(ms, 99), 4),
+            "mean_bytes": round(sum(sample["bytes"]) / len(sample["bytes"]), 1),
+            "max_bytes": max(sample["bytes"]),
+        }
+    return summary
+
+###############################################################################
+# 2) BĚH: VŠECHNY KONTINENTY ZE scope_map, VŠECHNY REŽIMY
+###############################################################################
+def run(games=3, seed=1234, modes=("engine", "direct", "http"), accuracy=0.7):
+    # Simulované hry nesmí do skutečného žebříčku ani do vah adaptivního výběru
+    os.environ["QUIZ_RESULTS_DB"] = "off"
+    import country_index
+    import guess
+    if guess.results_store is not None:
+        raise RuntimeError("guess was imported before bench.run - set QUIZ_RESULTS_DB=off")
+    from bench.dash_client import DashClient
+    from bench.scenarios import play_direct_game, play_engine_game, play_http_game
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "games_per_continent": games,
+            "seed": seed,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "callbacks": {},
+        "peak_memory_kb": {},
+        "guesses": {},
+    }
+    for mode in modes:
+        recorder = Recorder(mode)
+        rng = random.Random(seed)
+        gc.collect()
+        tracemalloc.start()
+        guesses = 0
+        if mode == "http":
+            client = DashClient(guess.app, on_response=recorder)
+        for continent in scope_map:
+            for _ in range(games):
+                if mode == "http":
+                    guesses += play_http_game(client, continent, rng, accuracy)
+                elif mode == "engine":
+                    guesses += play_engine_game(country_index.current(), continent, rng, recorder, accuracy)
+                else:
+                    guesses += play_direct_game(guess, continent, rng, recorder, accuracy)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results["callbacks"].update(summarize(recorder.samples))
+        results["peak_memory_kb"][mode] = round(peak / 1024, 1)
+        results["guesses"][mode] = guesses
+    return results
+
+###############################################################################
+# 3) POROVNÁNÍ DVOU BĚHŮ
+###############################################################################
+COMPARED_METRICS = ("p50_ms", "p90_ms", "mean_bytes")
+
+
+def compare(base, new, threshold=0.10, min_ms=0.05):
+    # Vrací seznam regresí; rozdíly pod min_ms se berou jako šum měření
+    regressions = []
+    rows = []
+    for name in sorted(set(base["callbacks"]) & set(new["callbacks"])):
+        for metric in COMPARED_METRICS:
+            old, cur = base["callbacks"][name][metric], new["callbacks"][name][metric]
+            change = (cur - old) / old if old else 0.0
+            rows.append((name, metric, old, cur, change))
+            noise = min_ms if metric.endswith("_ms") else 0
+            if change > threshold and cur - old > noise:
+                regressions.append((name, metric, old, cur, change))
+    for mode in sorted(set(base["peak_memory_kb"]) & set(new["peak_memory_kb"])):
+        old, cur = base["peak_memory_kb"][mode], new["peak_memory_kb"][mode]
+        change = (cur - old) / old if old else 0.0
+        rows.append((f"{mode}:peak_memory", "kb", old, cur, change))
+        if change > threshold:
+            regressions.append((f"{mode}:peak_memory", "kb", old, cur, change))
+    return rows, regressions
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save(results, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=1)
@@ -0,0 +1,137 @@
+import time
+
+from dash._callback import NoUpdate
+from dash._callback_context import context_value
+from dash._utils import AttributeDict, to_json
+
+import country_index
+import game_engine
+from quiz_state import undone_ids
+
+###############################################################################
+# 1) SIMULOVANÁ HRA PŘES HTTP (DashClient)
+###############################################################################
+# Hráč odpoví správně s pravděpodobností `accuracy`, občas odešle prázdný tip
+# (validační hláška), jinak zvolí náhodnou zbývající zemi.
+EMPTY_GUESS_RATE = 0.05
+
+
+def _click(client, button_id):
+    client.set(button_id, "n_clicks", (client.get(button_id, "n_clicks") or 0) + 1)
+
+
+def _click_data(data, guess_id):
+    # Kliknutí do mapy tak, jak ho pošle dcc.Graph; prázdný tip = klik mimo hádané země
+    if guess_id is None:
+        return {"points": []}
+    return {"points": [{"curveNumber": 0, "location": data.en_by_de[data.names[guess_id]]}]}
+
+
+def _pick_guess(rng, data, current_id, progress, accuracy):
+    # Volby dropdownu počítá prohlížeč (clientside) - tady je odvodíme z progressu
+    roll = rng.random()
+    if roll < EMPTY_GUESS_RATE:
+        return None
+    options = undone_ids(data, progress["continent"], progress["done"]) if progress else []
+    if roll < EMPTY_GUESS_RATE + accuracy or not options:
+        return current_id
+    return rng.choice(options)
+
+
+def play_http_game(client, continent, rng, accuracy=0.7, mode="map", adaptive=False):
+    _click(client, "btn-to-screen-2")
+    client.set("continent-dropdown", "value", continent)
+    client.props[("mode-select", "value")] = mode
+    client.props[("adaptive-select", "value")] = ["adaptive"] if adaptive else []
+    _click(client, "btn-to-screen-3")
+
+    # ID zemí platí ve verzi dat, kterou stránka dostala v layoutu
+    data = country_index.get_or_current(client.get("store-data-version", "data"))
+    guesses = 0
+    limit = 10 * len(data.names) + 10
+    while client.get("store-selected-country", "data") and guesses < limit:
+        current_id = data.id_by_de[client.get("store-selected-country", "data")]
+        guess = _pick_guess(rng, data, current_id, client.get("store-progress", "data"), accuracy)
+        if game_engine.get_mode(mode).input == "click":
+            client.set("blind-map", "clickData", _click_data(data, guess))
+        else:
+            # Hodnota dropdownu je jen State -> nastavení bez spuštění callbacků
+            client.props[("country-guess-dropdown", "value")] = guess
+            _click(client, "guess-button")
+        guesses += 1
+
+    _click(client, "btn-back-to-screen-2")
+    return guesses
+
+###############################################################################
+# 2) SIMULOVANÁ HRA PŘÍMÝM VOLÁNÍM CALLBACK FUNKCÍ (bez HTTP a Flasku)
+###############################################################################
+def _payload_bytes(result):
+    values = result if isinstance(result, tuple) else (result,)
+    return len(to_json([v for v in values if not NoUpdate.is_no_update(v)]))
+
+
+def _call(record, fn, trigger, *args):
+    # callback_context čte spouštěcí Input z contextvars - nastavíme ho jako Dash
+    context_value.set(AttributeDict(triggered_inputs=[{"prop_id": trigger, "value": 1}]))
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    record(fn.__name__, elapsed, _payload_bytes(result))
+    return result
+
+
+def play_direct_game(guess, continent, rng, record, accuracy=0.7, mode="map", adaptive=False):
+    screen = _call(record, guess.navigate_screens, "btn-to-screen-2.n_clicks", 1, 0, 0, 1)
+    _call(record, guess.switch_screens, "store-current-screen.data", screen)
+    screen = _call(record, guess.navigate_screens, "btn-to-screen-3.n_clicks", 1, 1, 0, screen)
+    _call(record, guess.switch_screens, "store-current-screen.data", screen)
+
+    data = country_index.current()
+    token = None
+    map_continent = None
+    progress = None
+    trigger, clicks, guess_id = "btn-to-screen-3.n_clicks", 0, None
+    by_click = game_engine.get_mode(mode).input == "click"
+    guesses = 0
+    while True:
+        # Jeden callback vrací stav i mapu (figuru nebo Patch) další země
+        selected, _, token_out, progress_out, _, _, map_out, _ = _call(
+            record, guess.quiz_logic, trigger, 1, clicks, _click_data(data, guess_id) if by_click else None,
+            continent, token, guess_id, map_continent, data.version, mode, ["adaptive"] if adaptive else []
+        )
+        if not NoUpdate.is_no_update(token_out):
+            token = token_out
+        if not NoUpdate.is_no_update(progress_out):
+            progress = progress_out
+        if not NoUpdate.is_no_update(map_out):
+            map_continent = map_out
+        if not NoUpdate.is_no_update(selected):
+            current = selected
+        if current is None:
+            break
+        trigger = "blind-map.clickData" if by_click else "guess-button.n_clicks"
+        clicks += 1
+        guess_id = _pick_guess(rng, data, data.id_by_de[current], progress, accuracy)
+        guesses += 1
+
+    screen = _call(record, guess.navigate_screens, "btn-back-to-screen-2.n_clicks", 1, 1, 1, screen)
+    _call(record, guess.switch_screens, "store-current-screen.data", screen)
+    return guesses
+
+###############################################################################
+# 3) SIMULOVANÁ HRA JEN NAD game_engine (bez Dash, session a mapy)
+###############################################################################
+def play_engine_game(data, continent, rng, record, accuracy=0.7, mode="map", adaptive=False):
+    start = time.perf_counter()
+    state = game_engine.start(data, continent, mode, now=0.0, rng=rng, adaptive=adaptive)
+    record("start", time.perf_counter() - start, 0)
+    guesses = 0
+    while state["current"] is not None:
+        progress = game_engine.progress(state, 0.0)
+        guess_id = _pick_guess(rng, data, state["current"], progress, accuracy)
+        start = time.perf_counter()
+        state, _ = game_engine.submit(state, data, guess_id, rng)
+        record("submit", time.perf_counter() - start, 0)
+        guesses += 1
+    return guesses
@@ -0,0 +1,133 @@
+import csv
+import hashlib
+import io
+import json
+import os
+
+###############################################################################
+# 1) NASTAVENÍ
+###############################################################################
+# Jediný zdroj dat o zemích: sloupcový soubor (CSV nebo JSON se seznamem záznamů),
+# jeden řádek = jedna země se středem, bounding boxem a volitelným zoomem.
+DATA_PATH = os.environ.get(
+    "QUIZ_COUNTRY_DATA", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "countries.csv")
+)
+
+# Sloupce: continent, country_de, country_en, capital_de, lat, lon, lon_min, lat_min,
+# lon_max, lat_max, zoom, micro (lat/lon a zoom jsou volitelné - dopočítají se z bboxu)
+REQUIRED = ("continent", "country_de", "country_en", "lon_min", "lat_min", "lon_max", "lat_max")
+
+# Kontinent -> "scope" mapy Plotly; kontinent mimo tuto tabulku je chyba v datech
+scope_map = {
+    "Europa":              "europe",
+    "Asien":               "asia",
+    "Afrika":              "africa",
+    "Nordamerika":         "north america",
+    "Südamerika":          "south america",
+    "Austrálie/Oceánie":   "world",
+    "Alle":                "world"
+}
+
+###############################################################################
+# 2) NAČTENÍ A VALIDACE
+###############################################################################
+class Dataset:
+    # Zvalidovaná data jedné verze souboru; version = otisk obsahu
+    def __init__(self, rows, version, path):
+        self.rows = rows
+        self.version = version
+        self.path = path
+
+
+def _parse_rows(raw, path):
+    if path.endswith(".json"):
+        return json.loads(raw.decode("utf-8"))
+    return list(csv.DictReader(io.StringIO(raw.decode("utf-8-sig"))))
+
+
+def _number(value, column, errors, line):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        errors.append(f"Zeile {line}: {column}={value!r} ist keine Zahl")
+        return None
+
+
+def _clean_row(raw_row, line, errors):
+    missing = [c for c in REQUIRED if raw_row.get(c) in (None, "")]
+    if missing:
+        errors.append(f"Zeile {line}: fehlende Spalten {', '.join(missing)}")
+        return None
+    if raw_row["continent"] not in scope_map or raw_row["continent"] == "Alle":
+        errors.append(f"Zeile {line}: unbekannter Kontinent {raw_row['continent']!r}")
+        return None
+
+    row = {c: str(raw_row[c]).strip() for c in ("continent", "country_de", "country_en")}
+    row["capital_de"] = str(raw_row.get("capital_de") or "").strip() or None
+    bbox = [_number(raw_row[c], c, errors, line) for c in ("lon_min", "lat_min", "lon_max", "lat_max")]
+    if None in bbox:
+        return None
+    lon_min, lat_min, lon_max, lat_max = bbox
+    if not (-180 <= lon_min < lon_max <= 180 and -90 <= lat_min < lat_max <= 90):
+        errors.append(f"Zeile {line}: ungültige Bounding-Box {bbox}")
+        return None
+    row["bbox"] = (lon_min, lat_min, lon_max, lat_max)
+
+    # Bez explicitního středu se použije střed bounding boxu
+    if raw_row.get("lat") in (None, "") or raw_row.get("lon") in (None, ""):
+        row["lat"], row["lon"] = round((lat_min + lat_max) / 2, 4), round((lon_min + lon_max) / 2, 4)
+    else:
+        row["lat"] = _number(raw_row["lat"], "lat", errors, line)
+        row["lon"] = _number(raw_row["lon"], "lon", errors, line)
+        if row["lat"] is None or row["lon"] is None:
+            return None
+        if not (lat_min <= row["lat"] <= lat_max and lon_min <= row["lon"] <= lon_max):
+            errors.append(f"Zeile {line}: Mittelpunkt liegt außerhalb der Bounding-Box")
+            return None
+
+    row["zoom"] = None
+    if raw_row.get("zoom") not in (None, ""):
+        row["zoom"] = _number(raw_row["zoom"], "zoom", errors, line)
+        if row["zoom"] is not None and row["zoom"] <= 0:
+            errors.append(f"Zeile {line}: zoom muss positiv sein")
+            return None
+    row["micro"] = str(raw_row.get("micro") or "0").strip() in ("1", "true", "True")
+    return row
+
+
+def validate(raw_rows):
+    errors = []
+    rows = []
+    seen_de, seen_en = set(), set()
+    for line, raw_row in enumerate(raw_rows, start=2):     # řádek 1 je hlavička CSV
+        row = _clean_row(raw_row, line, errors)
+        if row is None:
+            continue
+        if row["country_de"] in seen_de or row["country_en"] in seen_en:
+            errors.append(f"Zeile {line}: doppeltes Land {row['country_de']!r}")
+            continue
+        seen_de.add(row["country_de"])
+        seen_en.add(row["country_en"])
+        rows.append(row)
+    if not rows and not errors:
+        errors.append("keine Länder")
+    if len(rows) > 0xFFFF:
+        errors.append("zu viele Länder für uint16-IDs")     # quiz_state balí ID do uint16
+    if errors:
+        raise ValueError("Ungültige Länderdaten: " + "; ".join(errors[:20]))
+    return tuple(rows)
+
+
+def load(path=DATA_PATH):
+    with open(path, "rb") as f:
+        raw = f.read()
+    version = hashlib.sha1(raw).hexdigest()[:12]
+    return Dataset(validate(_parse_rows(raw, path)), version, path)
+
+
+if __name__ == "__main__":
+    # python country_data.py [soubor] - jen validace, např. v CI před nasazením
+    import sys
+
+    dataset = load(sys.argv[1] if len(sys.argv) > 1 else DATA_PATH)
+    print(f"{dataset.path}: {len(dataset.rows)} Länder, Version {dataset.version}")
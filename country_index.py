@@ -0,0 +1,158 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+
+from country_data import DATA_PATH, load, scope_map
+
+###############################################################################
+# 1) NASTAVENÍ
+###############################################################################
+ALL = "Alle"
+
+# Jak často (s) se kontroluje změna datového souboru; 0 = načíst jen jednou při startu
+RELOAD_INTERVAL = float(os.environ.get("QUIZ_DATA_RELOAD_INTERVAL", "5"))
+# Kolik starších verzí dat držet pro rozehrané hry a otevřené stránky
+KEEP_VERSIONS = 8
+
+# Rozsah (stupně délky, šířky) výchozího výřezu mapy pro "scope" Plotly při projection.scale=1
+SCOPE_EXTENT = {
+    "world": (360, 180), "europe": (90, 55), "asia": (138, 70), "africa": (90, 80),
+    "north america": (135, 80), "south america": (70, 75),
+}
+VIEW_FILL = 0.5          # jakou část výřezu má vybraná země zabrat
+MAX_SCALE = 40
+
+log = logging.getLogger("quiz.data")
+
+###############################################################################
+# 2) INDEX ZEMÍ JEDNÉ VERZE DAT (sestaví se jednou, dál jen O(1) lookupy)
+###############################################################################
+class CountryIndex:
+    def __init__(self, dataset):
+        rows = dataset.rows
+        self.version = dataset.version
+
+        # Stabilní celočíselná ID zemí = pořadí řádků v datovém souboru (v rámci verze)
+        self.names = tuple(r["country_de"] for r in rows)
+        self.id_by_de = MappingProxyType({de: i for i, de in enumerate(self.names)})
+        self.en_by_de = MappingProxyType({r["country_de"]: r["country_en"] for r in rows})
+        # Anglický název = "location" v choroplethu -> ID (hit-test kliknutí do mapy)
+        self.id_by_en = MappingProxyType({r["country_en"]: i for i, r in enumerate(rows)})
+        self.capital_by_de = MappingProxyType({r["country_de"]: r["capital_de"] for r in rows if r["capital_de"]})
+        self.continent_by_de = MappingProxyType({r["country_de"]: r["continent"] for r in rows})
+
+        # Kontinenty v pořadí, v jakém se nabízejí v dropdownu
+        self.continents = tuple(sorted(set(self.continent_by_de.values())))
+
+        by_continent = {ALL: self.names}
+        for cont in self.continents:
+            by_continent[cont] = tuple(r["country_de"] for r in rows if r["continent"] == cont)
+        self.names_by_continent = MappingProxyType(by_continent)
+        self.ids_by_continent = MappingProxyType({
+            cont: tuple(self.id_by_de[de] for de in cont_names) for cont, cont_names in by_continent.items()
+        })
+        self.en_names_by_continent = MappingProxyType({
+            cont: tuple(self.en_by_de[de] for de in cont_names) for cont, cont_names in by_continent.items()
+        })
+
+        # Mikro-státy, které na mapě daného kontinentu dostanou vlastní marker
+        self.micro_coords = MappingProxyType({r["country_de"]: (r["lat"], r["lon"]) for r in rows if r["micro"]})
+        self.micros_by_continent = MappingProxyType({
+            cont: tuple(de for de in cont_names if de in self.micro_coords) for cont, cont_names in by_continent.items()
+        })
+
+        # Střed a zoom mapy pro každou zemi na mapě každého kontinentu -> nikdy fitbounds
+        self.view_by_continent = MappingProxyType({
+            cont: MappingProxyType({
+                r["country_de"]: (r["lat"], r["lon"], _scale(r, scope_map.get(cont, "world")))
+                for r in rows if cont == ALL or r["continent"] == cont
+            })
+            for cont in by_continent
+        })
+
+    def continent_key(self, chosen_continent):
+        # Neznámý nebo prázdný kontinent -> všechny země (stejně jako dřív prázdný filtr)
+        if chosen_continent in self.names_by_continent:
+            return chosen_continent
+        return ALL
+
+
+def _scale(row, scope):
+    # Explicitní zoom z dat (mikro-státy) má přednost, jinak z bounding boxu vůči výřezu scope
+    if row["zoom"]:
+        return row["zoom"]
+    lon_min, lat_min, lon_max, lat_max = row["bbox"]
+    extent_lon, extent_lat = SCOPE_EXTENT.get(scope, SCOPE_EXTENT["world"])
+    scale = VIEW_FILL * min(extent_lon / (lon_max - lon_min), extent_lat / (lat_max - lat_min))
+    return round(min(max(scale, 1.0), MAX_SCALE), 2)
+
+###############################################################################
+# 3) AKTUÁLNÍ VERZE A HOT-RELOAD BEZ RESTARTU WORKERŮ
+###############################################################################
+# Každý request si vezme current() (levné: jen čas, stat souboru nejvýš jednou za
+# RELOAD_INTERVAL); hra si pamatuje verzi, se kterou začala, a dohraje se nad ní (get).
+_lock = threading.Lock()
+_versions = OrderedDict()       # verze -> CountryIndex
+_current = None
+_stamp = None                   # (mtime, velikost) naposledy zkontrolovaného souboru
+_next_check = 0.0
+
+
+def _file_stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _activate(dataset):
+    global _current
+    index = _versions.get(dataset.version) or CountryIndex(dataset)
+    _versions[dataset.version] = index
+    _versions.move_to_end(dataset.version)
+    while len(_versions) > KEEP_VERSIONS:
+        _versions.popitem(last=False)
+    if _current is not None and _current.version != index.version:
+        log.info("Länderdaten neu geladen: Version %s (%d Länder)", index.version, len(index.names))
+    _current = index
+
+
+def current(force=False):
+    # force=True: stat souboru hned, bez ohledu na RELOAD_INTERVAL
+    global _stamp, _next_check
+    now = time.monotonic()
+    if _current is not None and not force and (RELOAD_INTERVAL <= 0 or now < _next_check):
+        return _current
+    with _lock:
+        if _current is not None and not force and now < _next_check:
+            return _current
+        _next_check = now + RELOAD_INTERVAL
+        try:
+            stamp = _file_stamp(DATA_PATH)
+            if stamp != _stamp:
+                _stamp = stamp
+                _activate(load(DATA_PATH))
+        except (OSError, ValueError) as exc:
+            # Při startu je chyba v datech fatální, za běhu zůstane platná poslední dobrá verze
+            if _current is None:
+                raise
+            log.warning("Länderdaten nicht neu geladen: %s", exc)
+    return _current
+
+
+def get(version):
+    # Index konkrétní verze (rozehraná hra); None = verzi tento proces nezná (jiný nebo
+    # restartovaný worker, vypadla z KEEP_VERSIONS) - ID zemí staré verze se k aktuálnímu
+    # indexu nesmí použít, volající musí hru ukončit
+    current()
+    if version not in _versions:
+        # Jiný worker už mohl načíst novější soubor dřív než tento (RELOAD_INTERVAL) ->
+        # před verdiktem "neznámá verze" zkontrolovat soubor hned
+        current(force=True)
+    return _versions.get(version)
+
+
+def get_or_current(version):
+    # Pro výpisy bez ID zemí (žebříček, příprava mapy kontinentu): neznámá verze -> aktuální
+    return get(version) or current()
@@ -0,0 +1,153 @@
+import random
+import time
+
+from quiz_state import answer, is_repeat, missed_ids, new_state
+
+###############################################################################
+# 1) HERNÍ REŽIMY (generátory otázek)
+###############################################################################
+# Engine nezávisí na Dash ani Flasku: pracuje jen s indexem zemí (country_index.CountryIndex)
+# a kompaktním stavem z quiz_state. Odpověď je vždy ID země - režim určuje, co se
+# zvýrazní na mapě, čím se popisují volby odpovědí a jak se ukáže správné řešení.
+class MapMode:
+    # "Welches Land ist rot markiert?" - hledaná země je zvýrazněná, volby jsou názvy zemí
+    name = "map"
+    labels = "names"
+    highlight = True
+    input = "dropdown"       # odpověď výběrem z dropdownu, nebo "click" přímo do mapy
+
+    def eligible(self, data, ids):
+        return ids
+
+    def answer_text(self, data, country_id):
+        return data.names[country_id]
+
+
+class CapitalMode(MapMode):
+    # Zvýrazněná země, volby jsou hlavní města; jen země, které hlavní město v datech mají
+    name = "capital"
+    labels = "capitals"
+
+    def eligible(self, data, ids):
+        return tuple(i for i in ids if data.names[i] in data.capital_by_de)
+
+    def answer_text(self, data, country_id):
+        return data.capital_by_de[data.names[country_id]]
+
+
+class ReverseMode(MapMode):
+    # Zadaný je název, hráč zemi najde a klikne na ni v mapě (bez zvýraznění, bez dropdownu)
+    name = "reverse"
+    highlight = False
+    input = "click"
+
+
+MODES = {mode.name: mode for mode in (MapMode(), CapitalMode(), ReverseMode())}
+DEFAULT_MODE = "map"
+
+
+def get_mode(name):
+    return MODES.get(name) or MODES[DEFAULT_MODE]
+
+###############################################################################
+# 2) ADAPTIVNÍ VÝBĚR ZEMÍ (váhy podle chyb)
+###############################################################################
+# Váha = základ + podíl podle dlouhodobé chybovosti země (výsledky všech her, viz
+# results.ResultsStore.error_rates) + bonus, pokud ji hráč v této session naposledy
+# netrefil. Losuje se bez opakování podle vah (Fenwickův strom v quiz_state), takže
+# těžké země přijdou dřív; chybná odpověď vrátí zemi jednou do téže hry.
+BASE_WEIGHT = 10
+ERROR_WEIGHT = 40
+MISSED_WEIGHT = 40
+
+
+def adaptive_weights(data, ids, error_rates=None, missed=frozenset()):
+    error_rates = error_rates or {}
+    weights = []
+    for country_id in ids:
+        attempts, errors = error_rates.get(data.names[country_id], (0, 0))
+        rate = (errors + 1) / (attempts + 2)       # vyhlazení: neznámá země ~ 50 %
+        weights.append(BASE_WEIGHT + round(ERROR_WEIGHT * rate) + (MISSED_WEIGHT if country_id in missed else 0))
+    return weights
+
+###############################################################################
+# 3) PŘECHODY STAVU
+###############################################################################
+def start(data, chosen_continent, mode=DEFAULT_MODE, now=None, rng=random,
+          adaptive=False, error_rates=None, previous=None):
+    # previous: stav minulé hry téže session - její netrefené země se přenesou (stejná verze dat)
+    generator = get_mode(mode)
+    ids = generator.eligible(data, data.ids_by_continent[data.continent_key(chosen_continent)])
+    missed = missed_ids(previous) if previous and previous.get("data") == data.version else ()
+    weights = adaptive_weights(data, ids, error_rates, frozenset(missed)) if adaptive else None
+    state = new_state(data, chosen_continent, time.time() if now is None else now, rng,
+                      ids=ids, weights=weights, missed=missed)
+    state["mode"] = generator.name
+    state["adaptive"] = bool(adaptive)
+    return state
+
+
+def submit(state, data, guess_id, rng=random):
+    # Vyhodnotí odpověď; vrací (nový stav, výsledek) - výsledek je čistý dict pro adaptér
+    expected = state["current"]
+    repeat = is_repeat(state, expected)
+    state, correct = answer(state, guess_id, rng)
+    return state, {
+        "correct": correct,
+        "expected": expected,
+        "repeat": repeat,
+        "expected_text": get_mode(state.get("mode")).answer_text(data, expected),
+        "finished": state["current"] is None,
+    }
+
+
+def question(state, data):
+    # Aktuální otázka (nebo None po konci hry)
+    if state["current"] is None:
+        return None
+    generator = get_mode(state.get("mode"))
+    return {
+        "mode": generator.name,
+        "country": state["current"],
+        "country_de": data.names[state["current"]],
+        "highlight": generator.highlight,
+        "labels": generator.labels,
+        "input": generator.input,
+    }
+
+###############################################################################
+# 4) SKÓRE A PRŮBĚH PRO PROHLÍŽEČ
+###############################################################################
+def score(state):
+    answered = state["correct"] + state["wrong"]
+    return {
+        "correct": state["correct"],
+        "wrong": state["wrong"],
+        "accuracy": state["correct"] / answered if answered else 0.0,
+    }
+
+
+def progress(state, now):
+    return {
+        "continent": state["continent"],
+        "labels": get_mode(state.get("mode")).labels,
+        "input": get_mode(state.get("mode")).input,
+        "correct": state["correct"],
+        "wrong": state["wrong"],
+        "start": state["start"],
+        "done": state["done"],
+        "now": now,                                           # pro srovnání hodin prohlížeče
+        "end": now if state["current"] is None else None,     # po konci kvízu se čas zastaví
+    }
+
+###############################################################################
+# 5) SIMULACE (bez webového stacku - profilování a benchmarky)
+###############################################################################
+def simulate(data, chosen_continent, mode=DEFAULT_MODE, rng=random, accuracy=0.7, adaptive=False):
+    # Odehraje celou hru; špatná odpověď = náhodná země ze stejného kontinentu
+    state = start(data, chosen_continent, mode, now=0.0, rng=rng, adaptive=adaptive)
+    options = data.ids_by_continent[data.continent_key(chosen_continent)]
+    while state["current"] is not None:
+        guess_id = state["current"] if rng.random() < accuracy else rng.choice(options)
+        state, _ = submit(state, data, guess_id, rng)
+    return score(state)
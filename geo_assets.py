@@ -0,0 +1,230 @@
+import gzip
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+
+from flask import abort, request, send_file
+
+try:
+    import brotli
+except ImportError:      # brotli je volitelný - bez něj se předkomprimuje jen gzip
+    brotli = None
+
+###############################################################################
+# 1) NASTAVENÍ: LOKÁLNÍ HRANICE STÁTŮ (GeoJSON) VE TŘECH ÚROVNÍCH DETAILU
+###############################################################################
+# Soubory vyrábí `python geo_assets.py build <zdroj.geojson>` do GEO_DIR:
+#   manifest.json                  - názvy souborů (s hashem obsahu) a seznam zemí
+#   world-<úroveň>.<hash>.geojson  - zjednodušená geometrie (+ .gz / .br varianty)
+# Bez manifestu aplikace dál používá vestavěné mapy Plotly (locationmode="country names").
+GEO_DIR = os.environ.get("QUIZ_GEO_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "geo"))
+GEO_URL_PREFIX = "/geo/"
+
+# Tolerance Douglas-Peucker ve stupních a zaokrouhlení souřadnic
+LEVELS = {
+    "coarse": (0.1, 2),
+    "medium": (0.02, 3),
+    "fine":   (0.02, 3),
+}
+# Úroveň "fine" = "medium" + malé země (mikro-státy) v plném rozlišení zdroje; plná
+# geometrie celého světa by byla desítky MB a Evropa ji stáhne v každé hře.
+SMALL_EXTENT = 1.0                  # stupně: větší strana bounding boxu "malé" země
+SMALL_DETAIL = (0.0, 4)
+FULL_DETAIL_LEVELS = ("fine",)
+
+# "Alle" -> hrubá geometrie, Evropa (Monaco, Vatikán, ...) -> jemná, ostatní kontinenty -> střední
+LEVEL_BY_CONTINENT = {
+    "Alle":   "coarse",
+    "Europa": "fine",
+}
+DEFAULT_LEVEL = "medium"
+
+# Názvy ze zdrojových dat (např. Natural Earth) -> anglické názvy z data/countries.csv
+NAME_ALIASES = {
+    "United States of America": "United States",
+    "Czechia": "Czech Republic",
+    "Republic of Serbia": "Serbia",
+    "Dem. Rep. Congo": "Democratic Republic of the Congo",
+    "Bosnia and Herz.": "Bosnia and Herzegovina",
+    "Macedonia": "North Macedonia",
+    "Vatican": "Vatican City",
+    "Russian Federation": "Russia",
+    "Republic of Korea": "South Korea",
+    "Korea": "South Korea",
+    "Dem. Rep. Korea": "North Korea",
+    "Turkiye": "Turkey",
+}
+NAME_PROPERTIES = ("name", "ADMIN", "NAME", "NAME_EN")
+
+###############################################################################
+# 2) MANIFEST (načte se líně při první figuře, geometrii Python nikdy nečte)
+###############################################################################
+@lru_cache(maxsize=None)
+def load_manifest():
+    path = os.path.join(GEO_DIR, "manifest.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def level_for_continent(cont):
+    return LEVEL_BY_CONTINENT.get(cont, DEFAULT_LEVEL)
+
+
+def geojson_url(cont):
+    # URL souboru s geometrií pro daný kontinent, nebo None (bez lokálních dat)
+    manifest = load_manifest()
+    if not manifest:
+        return None
+    filename = manifest["levels"].get(level_for_continent(cont))
+    return GEO_URL_PREFIX + filename if filename else None
+
+
+def feature_names():
+    manifest = load_manifest()
+    return tuple(manifest["names"]) if manifest else ()
+
+###############################################################################
+# 3) FLASK ROUTE: PŘEDKOMPRIMOVANÉ SOUBORY S DLOUHOU CACHE
+###############################################################################
+def register_routes(flask_app):
+    @flask_app.route(GEO_URL_PREFIX + "<path:filename>")
+    def serve_geojson(filename):
+        manifest = load_manifest()
+        if not manifest or filename not in manifest["levels"].values():
+            abort(404)
+        accepted = request.headers.get("Accept-Encoding", "")
+        path, encoding = os.path.join(GEO_DIR, filename), None
+        for suffix, name in ((".br", "br"), (".gz", "gzip")):
+            if name in accepted and os.path.exists(path + suffix):
+                path, encoding = path + suffix, name
+                break
+        # send_file streamuje soubor z disku (bez načtení do paměti procesu)
+        response = send_file(path, mimetype="application/geo+json", conditional=True, max_age=31536000)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        # Název souboru obsahuje hash obsahu -> může se cachovat navždy
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+    return serve_geojson
+
+###############################################################################
+# 4) BUILD: ZJEDNODUŠENÍ ZDROJOVÉHO GEOJSON DO JEDNOTLIVÝCH ÚROVNÍ
+###############################################################################
+def _perpendicular_distance(p, a, b):
+    (x, y), (x1, y1), (x2, y2) = p, a, b
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 0 and dy == 0:
+        return ((x - x1) ** 2 + (y - y1) ** 2) ** 0.5
+    return abs(dy * x - dx * y + x2 * y1 - y2 * x1) / (dx * dx + dy * dy) ** 0.5
+
+
+def simplify_ring(points, tolerance):
+    # Douglas-Peucker bez rekurze; první a poslední bod se vždy zachovají
+    if tolerance <= 0 or len(points) < 5:
+        return points
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        max_dist, index = 0.0, None
+        for i in range(start + 1, end):
+            dist = _perpendicular_distance(points[i], points[start], points[end])
+            if dist > max_dist:
+                max_dist, index = dist, i
+        if index is not None and max_dist > tolerance:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return [p for p, k in zip(points, keep) if k]
+
+
+def _simplify_polygon(rings, tolerance, digits):
+    result = []
+    for ring in rings:
+        simplified = [[round(x, digits), round(y, digits)] for x, y in simplify_ring(ring, tolerance)]
+        if len(simplified) >= 4:
+            result.append(simplified)
+        elif not result:
+            # Vnější prstenec malé země nesmí zmizet - ponecháme ho nezjednodušený
+            result.append([[round(x, digits), round(y, digits)] for x, y in ring])
+    return result
+
+
+def simplify_geometry(geometry, tolerance, digits):
+    if geometry["type"] == "Polygon":
+        coordinates = _simplify_polygon(geometry["coordinates"], tolerance, digits)
+    elif geometry["type"] == "MultiPolygon":
+        coordinates = [_simplify_polygon(p, tolerance, digits) for p in geometry["coordinates"]]
+        coordinates = [p for p in coordinates if p]
+    else:
+        return geometry
+    return {"type": geometry["type"], "coordinates": coordinates}
+
+
+def _extent(geometry):
+    # Větší strana bounding boxu geometrie ve stupních
+    polygons = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry.get("coordinates", ())
+    points = [p for polygon in polygons for ring in polygon for p in ring]
+    if not points:
+        return 0.0
+    xs, ys = [p[0] for p in points], [p[1] for p in points]
+    return max(max(xs) - min(xs), max(ys) - min(ys))
+
+
+def _detail(level, geometry):
+    if level in FULL_DETAIL_LEVELS and _extent(geometry) < SMALL_EXTENT:
+        return SMALL_DETAIL
+    return LEVELS[level]
+
+
+def _feature_name(feature):
+    props = feature.get("properties") or {}
+    for key in NAME_PROPERTIES:
+        if props.get(key):
+            return NAME_ALIASES.get(props[key], props[key])
+    return None
+
+
+def build(source_path, out_dir=GEO_DIR):
+    with open(source_path, encoding="utf-8") as f:
+        source = json.load(f)
+    features = [(name, feat["geometry"]) for feat in source["features"]
+                if feat.get("geometry") and (name := _feature_name(feat))]
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {"levels": {}, "names": sorted({name for name, _ in features})}
+    for level in LEVELS:
+        collection = {"type": "FeatureCollection", "features": [
+            {"type": "Feature", "properties": {"name": name},
+             "geometry": simplify_geometry(geometry, *_detail(level, geometry))}
+            for name, geometry in features
+        ]}
+        data = json.dumps(collection, separators=(",", ":")).encode("utf-8")
+        filename = f"world-{level}.{hashlib.sha1(data).hexdigest()[:10]}.geojson"
+        path = os.path.join(out_dir, filename)
+        with open(path, "wb") as f:
+            f.write(data)
+        with open(path + ".gz", "wb") as f:
+            f.write(gzip.compress(data, compresslevel=9))
+        if brotli is not None:
+            with open(path + ".br", "wb") as f:
+                f.write(brotli.compress(data, quality=11))
+        manifest["levels"][level] = filename
+        print(f"{level:>6}: {filename} ({len(data) // 1024} kB)")
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    load_manifest.cache_clear()
+    return manifest
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != "build":
+        sys.exit("Usage: python geo_assets.py build <source.geojson> [out_dir]")
+    build(sys.argv[2], *sys.argv[3:4])
@@ -1,161 +1,190 @@
+import os
 import time
-import random
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from functools import lru_cache
 
 from flask import Flask
-from dash import Dash, dcc, html, Input, Output, State, callback_context, no_update
+from dash import Dash, dcc, html, Input, Output, State, ClientsideFunction, callback_context, no_update
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 
-from countries_data import countries_data  # Externí soubor s daty zemí
+import country_index  # O(1) index zemí nad daty z data/countries.csv (hot-reload)
+from map_figures import get_figure, get_patch, get_placeholder_figure, prefetch, resolve_click, warm_figure_cache  # cache figur mapy
+from session_store import create_backend, new_token  # stav kvízu na serveru
+from quiz_state import dump_state, load_state  # stav kvízu <-> JSON pro SQLite session
+import game_engine  # herní režimy, vyhodnocení a skóre (bez Dash)
+import geo_assets  # lokální GeoJSON hranice států
+import metrics  # měření callbacků + /metrics (Prometheus)
+import http_layer  # komprese, ETag/cache hlavičky a cache deterministických callbacků
+import results  # dohrané hry a chybovost zemí v SQLite (zápis na pozadí)
 
 ###############################################################################
-# 1) DATAFRAME
+# 1) PŘEDPOČÍTÁNÍ FIGUR MAPY
 ###############################################################################
-df = pd.DataFrame(countries_data)
+if os.environ.get("QUIZ_PRECOMPUTE_FIGURES") == "1":
+    warm_figure_cache()
 
 ###############################################################################
-# 2) MAPOVÁNÍ KONTINENTŮ NA PLOTLY SCOPE
+# 2) SESSION STORE (paměť procesu nebo SQLite podle QUIZ_SESSION_BACKEND)
 ###############################################################################
-scope_map = {
-    "Europa":              "europe",
-    "Asien":               "asia",
-    "Afrika":              "africa",
-    "Nordamerika":         "north america",
-    "Südamerika":          "south america",
-    "Austrálie/Oceánie":   "world",
-    "Alle":                "world"
-}
-
-###############################################################################
-# 3) KOORDINÁTY A ZOOM PRO MALÉ STÁTY (MICRO-COUNTRIES)
-###############################################################################
-micro_coords = {
-    "Andorra":       {"lat": 42.5063, "lon": 1.5218},
-    "Malta":         {"lat": 35.9375, "lon": 14.3754},
-    "Monaco":        {"lat": 43.7384, "lon": 7.4246},
-    "San Marino":    {"lat": 43.9424, "lon": 12.4578},
-    "Vatikanstadt":  {"lat": 41.9029, "lon": 12.4534},
-    "Luxemburg":     {"lat": 49.81,   "lon": 6.13},
-    "Liechtenstein": {"lat": 47.14,   "lon": 9.55},
-}
-
-micro_zooms = {
-    "Andorra":       (42.5063, 1.5218, 8),
-    "Malta":         (35.9375, 14.3754, 7),
-    "Monaco":        (43.7384, 7.4246, 10),
-    "San Marino":    (43.9424, 12.4578, 10),
-    "Vatikanstadt":  (41.9029, 12.4534, 12),
-    "Luxemburg":     (49.81,   6.13,   7),
-    "Liechtenstein": (47.14,   9.55,   10),
-}
+sessions = create_backend(dump=dump_state, load=load_state)
+results_store = results.create_store()   # None při QUIZ_RESULTS_DB=off
 
 ###############################################################################
-# 4) DEFAULT COORDINATES PRO VĚTŠÍ STÁTY (použijeme anglické názvy)
+# 3) TABULKA ZEMÍ PRO PROHLÍŽEČ (posílá se jednou v layoutu)
 ###############################################################################
-default_coords = {
-    "Germany": {"lat": 51.1657, "lon": 10.4515},
-    "France": {"lat": 46.6034, "lon": 1.8883},
-    "Spain": {"lat": 40.4637, "lon": -3.7492},
-    "Italy": {"lat": 41.8719, "lon": 12.5674},
-    "China": {"lat": 35.8617, "lon": 104.1954},
-    "Russia": {"lat": 61.5240, "lon": 105.3188},
-    "United States": {"lat": 37.0902, "lon": -95.7129},
-    "Canada": {"lat": 56.1304, "lon": -106.3468},
-    "Brazil": {"lat": -14.2350, "lon": -51.9253},
-    "Argentina": {"lat": -38.4161, "lon": -63.6167},
-    "Egypt": {"lat": 26.8206, "lon": 30.8025},
-    "Morocco": {"lat": 31.7917, "lon": -7.0926},
+def country_table(data):
+    return {
+        "names": list(data.names),
+        "capitals": [data.capital_by_de.get(de) for de in data.names],
+        "continents": {c: list(ids) for c, ids in data.ids_by_continent.items()},
+    }
+
+
+# Texty otázek podle herního režimu (game_engine.MODES)
+PROMPTS = {
+    "map": "Welches Land ist rot markiert?",
+    "capital": "Wie heißt die Hauptstadt des rot markierten Landes?",
+    "reverse": "Wo liegt {country}? Klicke das Land auf der Karte an.",
 }
+MODE_OPTIONS = [
+    {"label": "Land erkennen", "value": "map"},
+    {"label": "Hauptstadt nennen", "value": "capital"},
+    {"label": "Land auf der Karte anklicken", "value": "reverse"},
+]
+# Adaptivní výběr: těžké a naposledy netrefené země dřív, chybné se jednou vrátí
+ADAPTIVE_OPTIONS = [{"label": "Schwierige Länder üben (falsche kommen wieder)", "value": "adaptive"}]
 
 ###############################################################################
-# 5) FLASK + DASH (s Bootstrap tématem)
+# 4) FLASK + DASH (s Bootstrap tématem)
 ###############################################################################
 flask_app = Flask(__name__)
 app = Dash(__name__, server=flask_app, external_stylesheets=[dbc.themes.COSMO])
+geo_assets.register_routes(flask_app)
+metrics.install(app, session_counter=sessions.count)
+http_layer.install(app)   # až po metrics: jeho after_request běží jako první (komprese)
 
 ###############################################################################
-# 6) LAYOUT: 3 OBRAZOVKY A STORES PRO STAV A ČAS
+# 5) LAYOUT: 3 OBRAZOVKY A STORES PRO STAV A ČAS
 ###############################################################################
-app.layout = dbc.Container([
-    dcc.Store(id="store-current-screen", data=1),         # 1=Welcome, 2=Continent, 3=Quiz
-    dcc.Store(id="store-chosen-continent", data=None),
-    dcc.Store(id="store-selected-country", data=None),
-    dcc.Store(id="store-correct-count", data=0),
-    dcc.Store(id="store-wrong-count", data=0),
-    dcc.Store(id="store-done-countries", data=[]),
-    dcc.Store(id="store-remaining-countries", data=[]),
-    dcc.Store(id="store-start-time", data=None),
-
-    dbc.Navbar(
-        dbc.Container([
-            dbc.NavbarBrand("Länder-Ratespiel (Blindkarte)", className="ms-2")
-        ]),
-        color="dark", dark=True, className="mb-4"
-    ),
-
-    # SCREEN 1: Vítejte
-    dbc.Card(
-        [
-            dbc.CardHeader("Willkommen"),
-            dbc.CardBody([
-                html.H4("Mina & Valentina – Herzlich willkommen!", className="card-title", style={"textAlign": "center"}),
-                html.P("Kleines Länder-Ratespiel na Blindkarte.", className="card-text", style={"textAlign": "center"}),
-                dbc.Button("Weiter", id="btn-to-screen-2", n_clicks=0, color="primary", className="d-block mx-auto mt-3")
-            ])
-        ],
-        id="screen-1",
-        style={"maxWidth": "600px", "margin": "0 auto 2rem auto"}
-    ),
-
-    # SCREEN 2: Kontinent výběr
-    dbc.Card(
-        [
-            dbc.CardHeader("Kontinent auswählen"),
-            dbc.CardBody([
-                dcc.Dropdown(
-                    id="continent-dropdown",
-                    options=[{"label": "Alle", "value": "Alle"}] + [
-                        {"label": c, "value": c} for c in sorted(df["continent"].unique())
-                    ],
-                    placeholder="Kontinent auswählen...",
-                    style={"width": "100%", "maxWidth": "300px", "marginBottom": "20px"}
-                ),
-                dbc.Button("Spiel starten", id="btn-to-screen-3", n_clicks=0, color="success")
-            ])
-        ],
-        id="screen-2",
-        style={"display": "none", "maxWidth": "600px", "margin": "0 auto 2rem auto"}
-    ),
-
-    # SCREEN 3: Quiz
-    dbc.Card(
-        [
-            dbc.CardHeader("Quiz"),
-            dbc.CardBody([
-                html.Div([
-                    html.Label("Welches Land ist rot markiert?", style={"fontWeight": "bold"}),
-                    dcc.Dropdown(id="country-guess-dropdown", style={"width": "100%", "maxWidth": "300px"}),
-                    dbc.Button("Tipp absenden", id="guess-button", n_clicks=0, color="primary", className="mt-2"),
-                    html.Div(id="guess-result", style={"marginTop": "1em", "fontWeight": "bold", "color": "#333"}),
-                ], className="mb-3"),
-
-                dcc.Graph(id="blind-map", style={"height": "600px"}),
-
-                html.Div(id="score-display", className="mt-3 text-center"),
-                html.Div(id="lists-display", className="mt-3 text-center"),
-
-                dbc.Button("Zurück zur Kontinent-Auswahl", id="btn-back-to-screen-2", n_clicks=0, color="secondary", className="mt-3")
-            ])
-        ],
-        id="screen-3",
-        style={"display": "none", "maxWidth": "900px", "margin": "0 auto 2rem auto"}
-    )
-], fluid=True, className="pt-4")
+# Layout závisí na verzi dat (tabulka zemí, kontinenty) -> funkce s cache podle verze;
+# po hot-reloadu dat dostanou nová načtení stránky novou tabulku bez restartu workerů.
+@lru_cache(maxsize=country_index.KEEP_VERSIONS)
+def build_layout(data):
+    return dbc.Container([
+        dcc.Store(id="store-data-version", data=data.version),  # verze dat, ke které patří tabulka zemí
+        dcc.Store(id="store-current-screen", data=1),         # 1=Welcome, 2=Continent, 3=Quiz
+        dcc.Store(id="store-chosen-continent", data=None),
+        dcc.Store(id="store-selected-country", data=None),
+        dcc.Store(id="store-session", data=None),             # token stavu kvízu uloženého na serveru
+        dcc.Store(id="store-progress", data=None),            # skóre, start a bitmaska hotových zemí
+        dcc.Store(id="store-countries", data=country_table(data)),  # názvy zemí podle ID pro clientside callbacky
+        dcc.Interval(id="timer-interval", interval=1000),     # tiká jen v prohlížeči
+        dcc.Store(id="store-map-continent", data=None),       # "verze:kontinent" základní mapy, která je v prohlížeči
+
+        dbc.Navbar(
+            dbc.Container([
+                dbc.NavbarBrand("Länder-Ratespiel (Blindkarte)", className="ms-2")
+            ]),
+            color="dark", dark=True, className="mb-4"
+        ),
+
+        # SCREEN 1: Vítejte
+        dbc.Card(
+            [
+                dbc.CardHeader("Willkommen"),
+                dbc.CardBody([
+                    html.H4("Mina & Valentina – Herzlich willkommen!", className="card-title", style={"textAlign": "center"}),
+                    html.P("Kleines Länder-Ratespiel na Blindkarte.", className="card-text", style={"textAlign": "center"}),
+                    dbc.Button("Weiter", id="btn-to-screen-2", n_clicks=0, color="primary", className="d-block mx-auto mt-3")
+                ])
+            ],
+            id="screen-1",
+            style={"maxWidth": "600px", "margin": "0 auto 2rem auto"}
+        ),
+
+        # SCREEN 2: Kontinent výběr
+        dbc.Card(
+            [
+                dbc.CardHeader("Kontinent auswählen"),
+                dbc.CardBody([
+                    dcc.Dropdown(
+                        id="continent-dropdown",
+                        options=[{"label": "Alle", "value": "Alle"}] + [
+                            {"label": c, "value": c} for c in data.continents
+                        ],
+                        placeholder="Kontinent auswählen...",
+                        style={"width": "100%", "maxWidth": "300px", "marginBottom": "20px"}
+                    ),
+                    dbc.RadioItems(id="mode-select", options=MODE_OPTIONS, value=game_engine.DEFAULT_MODE, className="mb-3"),
+                    dbc.Checklist(id="adaptive-select", options=ADAPTIVE_OPTIONS, value=[], switch=True, className="mb-3"),
+                    dbc.Button("Spiel starten", id="btn-to-screen-3", n_clicks=0, color="success"),
+                    html.Div(id="results-board", className="mt-4")
+                ])
+            ],
+            id="screen-2",
+            style={"display": "none", "maxWidth": "600px", "margin": "0 auto 2rem auto"}
+        ),
+
+        # SCREEN 3: Quiz
+        dbc.Card(
+            [
+                dbc.CardHeader("Quiz"),
+                dbc.CardBody([
+                    html.Div([
+                        html.Label(PROMPTS[game_engine.DEFAULT_MODE], id="question-prompt", style={"fontWeight": "bold"}),
+                        # V režimu "klik do mapy" se dropdown i tlačítko skryjí (clientside)
+                        html.Div([
+                            dcc.Dropdown(id="country-guess-dropdown", style={"width": "100%", "maxWidth": "300px"}),
+                            dbc.Button("Tipp absenden", id="guess-button", n_clicks=0, color="primary", className="mt-2"),
+                        ], id="guess-controls"),
+                        html.Div(id="guess-result", style={"marginTop": "1em", "fontWeight": "bold", "color": "#333"}),
+                    ], className="mb-3"),
+
+                    dcc.Graph(id="blind-map", style={"height": "600px"}),
+
+                    # Pevná struktura karet - callbacky mění jen texty ve <span>/<p>
+                    html.Div(
+                        dbc.Card(
+                            dbc.CardBody([
+                                html.H5("Aktueller Punktestand", className="card-title"),
+                                html.P(["Korrekt: ", html.Span("0", id="score-correct")], style={"margin": "0"}),
+                                html.P(["Falsch: ", html.Span("0", id="score-wrong")], style={"margin": "0"}),
+                                html.P(["Zeit: ", html.Span("0 s", id="score-time")], style={"margin": "0", "marginTop": "8px", "fontStyle": "italic"})
+                            ]),
+                            className="border p-2 d-inline-block"
+                        ),
+                        id="score-display", className="mt-3 text-center"
+                    ),
+                    html.Div(
+                        dbc.Card(
+                            dbc.CardBody([
+                                html.H6("Verbleibende Länder:"),
+                                html.P("Keine mehr", id="list-remaining"),
+                                html.H6("Bereits gemacht:"),
+                                html.P("Noch keine", id="list-done")
+                            ]),
+                            className="border p-2 mt-2"
+                        ),
+                        id="lists-display", className="mt-3 text-center"
+                    ),
+
+                    dbc.Button("Zurück zur Kontinent-Auswahl", id="btn-back-to-screen-2", n_clicks=0, color="secondary", className="mt-3")
+                ])
+            ],
+            id="screen-3",
+            style={"display": "none", "maxWidth": "900px", "margin": "0 auto 2rem auto"}
+        )
+    ], fluid=True, className="pt-4")
+
+
+def serve_layout():
+    return build_layout(country_index.current())
+
+
+app.layout = serve_layout
 
 ###############################################################################
-# 7) CALLBACK: ZOBRAZENÍ OBRAZOVEK
+# 6) CALLBACK: ZOBRAZENÍ OBRAZOVEK
 ###############################################################################
 @app.callback(
     Output("screen-1", "style"),
@@ -163,6 +192,7 @@ app.layout = dbc.Container([
     Output("screen-3", "style"),
     Input("store-current-screen", "data")
 )
+@metrics.timed
 def switch_screens(current_screen):
     style_hidden = {"display": "none"}
     style_1 = {"display": "block", "maxWidth": "600px", "margin": "0 auto 2rem auto", "textAlign": "center"}
@@ -176,7 +206,7 @@ def switch_screens(current_screen):
         return style_hidden, style_hidden, style_3
 
 ###############################################################################
-# 8) CALLBACK: NAVIGACE MEZI OBRAZOVKAMI
+# 7) CALLBACK: NAVIGACE MEZI OBRAZOVKAMI
 ###############################################################################
 @app.callback(
     Output("store-current-screen", "data"),
@@ -186,6 +216,7 @@ def switch_screens(current_screen):
     State("store-current-screen", "data"),
     prevent_initial_call=True
 )
+@metrics.timed
 def navigate_screens(n1, n2, n3, current_screen):
     ctx = callback_context
     if not ctx.triggered:
@@ -200,228 +231,247 @@ def navigate_screens(n1, n2, n3, current_screen):
     return current_screen
 
 ###############################################################################
-# 9) CALLBACK: ULOŽENÍ VYBRANÉHO KONTINENTU
+# 8) CALLBACK: ULOŽENÍ VYBRANÉHO KONTINENTU
 ###############################################################################
 @app.callback(
     Output("store-chosen-continent", "data"),
     Input("continent-dropdown", "value"),
-    State("store-chosen-continent", "data")
+    State("store-chosen-continent", "data"),
+    State("store-data-version", "data")
 )
-def set_continent(cont_val, old_val):
+@metrics.timed
+def set_continent(cont_val, old_val, data_version):
     if cont_val is None:
         return old_val
+    # Než hráč klikne na "Spiel starten", základní mapa kontinentu se připraví na pozadí
+    prefetch(cont_val, country_index.get_or_current(data_version))
     return cont_val
 
 ###############################################################################
-# 10) CALLBACK: LOGIKA QUIZU (inicializace + tipování)
+# 9) CALLBACK: LOGIKA QUIZU (inicializace + vyhodnocení tipu)
 ###############################################################################
+# Vrací jen to, co se opravdu změnilo; skóre, seznamy, volby dropdownu a čas si
+# z malého "store-progress" překresluje prohlížeč sám (clientside callbacky níže).
+# Mapa další země jde ve stejné odpovědi - tip = jeden request místo řetězu dvou.
 @app.callback(
-    Output("country-guess-dropdown", "options"),
     Output("store-selected-country", "data"),
     Output("guess-result", "children"),
-    Output("store-correct-count", "data"),
-    Output("store-wrong-count", "data"),
-    Output("store-done-countries", "data"),
-    Output("store-remaining-countries", "data"),
-    Output("score-display", "children"),
-    Output("lists-display", "children"),
+    Output("store-session", "data"),
+    Output("store-progress", "data"),
     Output("country-guess-dropdown", "value"),   # vyčištění výběru
-    Output("store-start-time", "data"),
+    Output("blind-map", "figure"),
+    Output("store-map-continent", "data"),
+    Output("question-prompt", "children"),
     Input("btn-to-screen-3", "n_clicks"),       # "Spiel starten"
     Input("guess-button", "n_clicks"),          # "Tipp absenden"
+    Input("blind-map", "clickData"),            # odpověď kliknutím do mapy
     State("store-chosen-continent", "data"),
-    State("store-selected-country", "data"),
-    State("store-correct-count", "data"),
-    State("store-wrong-count", "data"),
-    State("store-done-countries", "data"),
-    State("store-remaining-countries", "data"),
+    State("store-session", "data"),
     State("country-guess-dropdown", "value"),
-    State("store-start-time", "data"),
+    State("store-map-continent", "data"),
+    State("store-data-version", "data"),
+    State("mode-select", "value"),
+    State("adaptive-select", "value"),
     prevent_initial_call=True
 )
-def quiz_logic(start_click, guess_click,
+@metrics.timed
+def quiz_logic(start_click, guess_click, click_data,
                chosen_continent,
-               current_country_de,
-               correct_count,
-               wrong_count,
-               done_countries,
-               remaining_countries,
-               user_guess_de,
-               start_time):
-    import time
+               session_token,
+               user_guess_id,
+               map_continent,
+               data_version,
+               mode,
+               adaptive_value):
+    # Tenký adaptér: pravidla hry jsou v game_engine, tady jen session, texty a mapa
     now = time.time()
     ctx = callback_context
     if not ctx.triggered:
-        return no_update, no_update, "", correct_count, wrong_count, done_countries, remaining_countries, no_update, no_update, no_update, no_update
+        return _message_only("")
     trig_id = ctx.triggered[0]["prop_id"].split(".")[0]
 
-    # Filtrace DF dle vybraného kontinentu
-    if not chosen_continent or chosen_continent == "Alle":
-        sub_df = df
-    else:
-        sub_df = df[df["continent"] == chosen_continent]
-        if sub_df.empty:
-            sub_df = df
-
-    message = ""
+    # Stav kvízu je na serveru, prohlížeč drží jen token
+    state = sessions.get(session_token) if session_token else None
+    token_out = no_update
 
     # Pokud je kliknuto na "Spiel starten" -> inicializace
+    # Nová hra bere data ve verzi tabulky zemí na stránce, rozehraná tu, se kterou začala
     if trig_id == "btn-to-screen-3":
-        correct_count = 0
-        wrong_count = 0
-        done_countries = []
-        remaining_countries = sub_df["country_de"].tolist()
-        start_time = now
-        if remaining_countries:
-            current_country_de = random.choice(remaining_countries)
-        else:
-            current_country_de = None
+        data = country_index.get(data_version)
+        if data is None:
+            # Tabulka zemí na stránce patří k verzi dat, kterou server už nemá
+            return _data_expired(session_token)
+        adaptive = "adaptive" in (adaptive_value or ())
+        error_rates = results_store.error_rates(game_engine.get_mode(mode).name) if adaptive and results_store else None
+        state = game_engine.start(data, chosen_continent, mode, now,
+                                  adaptive=adaptive, error_rates=error_rates, previous=state)
+        metrics.game_started(data.continent_key(chosen_continent))   # jen známé kontinenty - omezená kardinalita
+        if not session_token:
+            session_token = token_out = new_token()
         message = "Quiz initialisiert!"
 
-    # Pokud je kliknuto na "Tipp absenden" -> vyhodnocení
-    elif trig_id == "guess-button":
-        if not current_country_de:
-            message = "Keine Länder mehr übrig nebo Quiz nicht gestartet."
-        else:
-            if not user_guess_de:
-                message = "Bitte wähle ein Land aus dem Dropdown!"
-            else:
-                if user_guess_de == current_country_de:
-                    message = "Richtig! Neues Land wurde geladen."
-                    correct_count += 1
-                else:
-                    message = f"Falsch! Richtig war: {current_country_de}"
-                    wrong_count += 1
-                if current_country_de not in done_countries:
-                    done_countries.append(current_country_de)
-                remaining_countries = [c for c in remaining_countries if c != current_country_de]
-                if remaining_countries:
-                    current_country_de = random.choice(remaining_countries)
-                else:
-                    message += " Quiz beendet!"
-                    current_country_de = None
-
-    # Dropdown: pouze zbývající země (hotové země se neukazují)
-    dropdown_options = [{"label": c, "value": c} for c in remaining_countries]
-
-    # Výpočet času
-    if start_time is None:
-        elapsed = 0
+    # Pokud je kliknuto na "Tipp absenden" nebo do mapy -> vyhodnocení
     else:
-        elapsed = now - start_time
-    elapsed_str = f"{int(elapsed)} s" if elapsed < 120 else f"{int(elapsed // 60)} min {int(elapsed % 60)} s"
-
-    score_display = dbc.Card(
-        dbc.CardBody([
-            html.H5("Aktueller Punktestand", className="card-title"),
-            html.P(f"Korrekt: {correct_count}", style={"margin": "0"}),
-            html.P(f"Falsch: {wrong_count}", style={"margin": "0"}),
-            html.P(f"Zeit: {elapsed_str}", style={"margin": "0", "marginTop": "8px", "fontStyle": "italic"})
-        ]),
-        className="border p-2 d-inline-block"
-    )
-
-    lists_display = dbc.Card(
-        dbc.CardBody([
-            html.H6("Verbleibende Länder:"),
-            html.P(", ".join(remaining_countries) if remaining_countries else "Keine mehr"),
-            html.H6("Bereits gemacht:"),
-            html.P(", ".join(done_countries) if done_countries else "Noch keine")
-        ]),
-        className="border p-2 mt-2"
-    )
-
-    return (
-        dropdown_options,
-        current_country_de,
-        message,
-        correct_count,
-        wrong_count,
-        done_countries,
-        remaining_countries,
-        score_display,
-        lists_display,
-        None,       # vyčištění výběru
-        start_time
-    )
+        current_id = state["current"] if state else None
+        data = country_index.get(state["data"]) if state else None
+        if current_id is not None and data is None:
+            return _data_expired(session_token)
+        if trig_id == "blind-map":
+            # Kliknutí do mapy je odpověď jen v režimu, který je tak hraje
+            if current_id is None or game_engine.get_mode(state.get("mode")).input != "click":
+                raise PreventUpdate
+            user_guess_id = resolve_click(click_data, data)
+            if user_guess_id is None:
+                return _message_only("Bitte klicke auf ein Land des Quiz!")
+        if current_id is None:
+            return _message_only("Keine Länder mehr übrig nebo Quiz nicht gestartet.")
+        if user_guess_id is None:
+            return _message_only("Bitte wähle ein Land aus dem Dropdown!")
+        state, result = game_engine.submit(state, data, user_guess_id)
+        _record_result(state, data, result, now)
+        if result["correct"]:
+            message = "Richtig! Neues Land wurde geladen."
+        else:
+            message = f"Falsch! Richtig war: {result['expected_text']}"
+        if result["finished"]:
+            message += " Quiz beendet!"
+            metrics.game_finished(data.continent_key(state["continent"]))
+
+    sessions.set(session_token, state)
+    question = game_engine.question(state, data)
+    figure, map_continent_out = _map_outputs(question, state["continent"], map_continent, data)
+    prompt = PROMPTS[question["mode"]].format(country=question["country_de"]) if question else no_update
+    return (question["country_de"] if question else None, message, token_out,
+            game_engine.progress(state, now), None, figure, map_continent_out, prompt)
+
+
+def _data_expired(session_token):
+    # Hra běží nad verzí dat, kterou tento worker nezná -> ukončit ji, ne hádat nad jinými ID
+    if session_token:
+        sessions.delete(session_token)
+    message = "Die Länderdaten wurden aktualisiert. Bitte lade die Seite neu und starte das Quiz erneut."
+    return None, message, None, None, None, get_placeholder_figure(), None, no_update
+
+
+def _message_only(message):
+    # Validační hláška - ostatní výstupy zůstávají beze změny
+    return no_update, message, no_update, no_update, no_update, no_update, no_update, no_update
 
 ###############################################################################
-# 10) CALLBACK: MAPA
+# 10) CLIENTSIDE CALLBACKY: VOLBY DROPDOWNU, SKÓRE, ČAS A SEZNAMY (assets/quiz.js)
 ###############################################################################
-@app.callback(
-    Output("blind-map", "figure"),
-    Input("store-selected-country", "data"),
-    State("store-chosen-continent", "data")
+# Počítají se v prohlížeči z "store-progress" a "store-countries" - žádný dotaz na server.
+app.clientside_callback(
+    ClientsideFunction(namespace="quiz", function_name="dropdownOptions"),
+    Output("country-guess-dropdown", "options"),
+    Input("store-progress", "data"),
+    State("store-countries", "data"),
+    prevent_initial_call=True
 )
-def update_map(chosen_country_de, chosen_continent):
-    if not chosen_country_de:
-        return px.scatter(x=[0], y=[0], title="Bitte wähle einen Kontinent und starte das Spiel.")
 
-    cont = chosen_continent if chosen_continent else "Alle"
-    scope_val = scope_map.get(cont, "world")
+app.clientside_callback(
+    ClientsideFunction(namespace="quiz", function_name="answerControls"),
+    Output("guess-controls", "style"),
+    Input("store-progress", "data"),
+    prevent_initial_call=True
+)
 
-    row = df.loc[df["country_de"] == chosen_country_de]
-    selected_en = row["country_en"].values[0] if not row.empty else None
+app.clientside_callback(
+    ClientsideFunction(namespace="quiz", function_name="renderScore"),
+    Output("score-correct", "children"),
+    Output("score-wrong", "children"),
+    Input("store-progress", "data"),
+    prevent_initial_call=True
+)
 
-    df_map = df.copy()
-    df_map["color"] = df_map["country_en"].apply(lambda x: "selected" if x == selected_en else "non-selected")
+app.clientside_callback(
+    ClientsideFunction(namespace="quiz", function_name="renderTimer"),
+    Output("score-time", "children"),
+    Input("timer-interval", "n_intervals"),
+    Input("store-progress", "data"),
+    prevent_initial_call=True
+)
 
-    if cont == "Alle":
-        sub_df_map = df_map
-    else:
-        sub_df_map = df_map[df_map["continent"] == cont]
-        if sub_df_map.empty:
-            sub_df_map = df_map
-
-    fig = px.choropleth(
-        sub_df_map,
-        locations="country_en",
-        locationmode="country names",
-        color="color",
-        color_discrete_map={"selected": "red", "non-selected": "lightgrey"},
-        scope=scope_val,
-        height=600
-    )
-    fig.update_layout(title=f"Karte ({cont})", showlegend=False)
-
-    # Přidání markerů pro mikro-státy (bez popisků)
-    micro_data = {"country": [], "lat": [], "lon": [], "color": [], "size": []}
-    for micro, coords in micro_coords.items():
-        if micro in df["country_de"].values:
-            if cont == "Alle" or micro in df[df["continent"] == cont]["country_de"].values:
-                micro_data["country"].append(micro)
-                micro_data["lat"].append(coords["lat"])
-                micro_data["lon"].append(coords["lon"])
-                if chosen_country_de == micro:
-                    micro_data["color"].append("red")
-                    micro_data["size"].append(12)
-                else:
-                    micro_data["color"].append("black")
-                    micro_data["size"].append(8)
-    if micro_data["country"]:
-        fig.add_trace(go.Scattergeo(
-            lon=micro_data["lon"],
-            lat=micro_data["lat"],
-            mode="markers",
-            marker=dict(size=micro_data["size"], color=micro_data["color"]),
-            showlegend=False
-        ))
-
-    # Vždy přiblížíme mapu na právě vybranou zemi.
-    # Pokud je vybraná země v micro_zooms, použijeme její specifický zoom.
-    # Jinak se pokusíme získat souřadnice z default_coords (na základě anglického názvu)
-    if chosen_country_de in micro_zooms:
-        lat, lon, scale = micro_zooms[chosen_country_de]
-        fig.update_geos(center=dict(lat=lat, lon=lon), projection_scale=scale)
-    elif selected_en and selected_en in default_coords:
-        coords = default_coords[selected_en]
-        fig.update_geos(center=dict(lat=coords["lat"], lon=coords["lon"]), projection_scale=10)
-    else:
-        fig.update_geos(fitbounds="locations", projection_scale=10)
-    return fig
+app.clientside_callback(
+    ClientsideFunction(namespace="quiz", function_name="renderLists"),
+    Output("list-remaining", "children"),
+    Output("list-done", "children"),
+    Input("store-progress", "data"),
+    State("store-countries", "data"),
+    prevent_initial_call=True
+)
+
+###############################################################################
+# 11) MAPA (součást odpovědi quiz_logic)
+###############################################################################
+def _map_outputs(question, chosen_continent, map_continent, data):
+    if question is None:
+        return get_placeholder_figure(), None
+    # Režimy bez zvýraznění (hráč zemi hledá sám) dostanou mapu kontinentu bez červené
+    chosen_country_de = question["country_de"] if question["highlight"] else None
+
+    # Základní mapa kontinentu se pošle jen jednou (při startu kvízu),
+    # další tipy posílají jen Patch se změněným zvýrazněním a středem mapy.
+    # Klíč obsahuje verzi dat - po hot-reloadu se základ pošle znovu.
+    cont = data.continent_key(chosen_continent)
+    map_key = f"{data.version}:{cont}"
+    if map_continent == map_key:
+        return get_patch(chosen_country_de, cont, data), no_update
+    return get_figure(chosen_country_de, cont, data), map_key
+
+###############################################################################
+# 12) VÝSLEDKY: ZÁPIS DO FRONTY A ŽEBŘÍČEK NA OBRAZOVCE 2
+###############################################################################
+def _record_result(state, data, result, now):
+    # Jen vložení do fronty - na disk to zapíše vlákno results_store po dávkách
+    if results_store is None:
+        return
+    mode = game_engine.get_mode(state.get("mode")).name
+    if not result["repeat"]:
+        # Opakovaná otázka adaptivní hry by chybovost země zkreslila (první chyba už je započtená)
+        results_store.record_answer(data.names[result["expected"]], mode, result["correct"])
+    if result["finished"]:
+        results_store.record_game(data.continent_key(state["continent"]), mode, data.version,
+                                  state["correct"], state["wrong"], now - state["start"],
+                                  adaptive=state.get("adaptive", False))
+
+
+@app.callback(
+    Output("results-board", "children"),
+    Input("continent-dropdown", "value"),
+    Input("mode-select", "value"),
+    Input("adaptive-select", "value"),
+    Input("btn-back-to-screen-2", "n_clicks"),   # po hře ukázat aktualizovaný žebříček
+    State("store-data-version", "data")
+)
+@metrics.timed
+def show_results(chosen_continent, mode, adaptive_value, back_clicks, data_version):
+    if results_store is None:
+        return None
+    data = country_index.get_or_current(data_version)
+    cont = data.continent_key(chosen_continent)
+    mode = game_engine.get_mode(mode).name
+    adaptive = "adaptive" in (adaptive_value or ())
+    board = results_store.leaderboard(cont, mode, limit=5, adaptive=adaptive)
+    hardest = results_store.hardest(mode, limit=5, countries=frozenset(data.names_by_continent[cont]))
+    return dbc.Row([
+        dbc.Col([
+            html.H6(f"Bestenliste: {cont}" + (" (Üben)" if adaptive else "")),
+            html.Ol([
+                html.Li(f"{row['correct']} richtig, {row['wrong']} falsch, {row['seconds']:.0f} s") for row in board
+            ]) if board else html.P("Noch keine Spiele", className="text-muted"),
+        ], md=6),
+        dbc.Col([
+            html.H6("Am häufigsten falsch"),
+            html.Ol([
+                html.Li(f"{row['country']} ({row['error_rate']:.0%} von {row['attempts']})") for row in hardest
+            ]) if hardest else html.P("Noch zu wenige Tipps", className="text-muted"),
+        ], md=6),
+    ])
 
 ###############################################################################
-# 11) SPUŠTĚNÍ FLASK-SERVERU
+# 13) SPUŠTĚNÍ FLASK-SERVERU
 ###############################################################################
 if __name__ == "__main__":
-    app.run_server(debug=True, host="0.0.0.0", port=8080)
+    # Jen pro vývoj; v produkci gunicorn (wsgi.py) nebo uvicorn (asgi.py)
+    app.run_server(debug=os.environ.get("QUIZ_DEBUG", "1") == "1", host="0.0.0.0", port=int(os.environ.get("PORT", "8080")))
@@ -0,0 +1,24 @@
+import multiprocessing
+import os
+
+###############################################################################
+# GUNICORN: VÍCE PROCESŮ S VLÁKNY (gunicorn -c gunicorn.conf.py wsgi:application)
+###############################################################################
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+
+# Import aplikace (a předpočítání figur) proběhne jednou v masteru před fork()
+preload_app = True
+
+# Recyklace workerů proti pomalému růstu paměti; stav kvízu přežije díky SQLite
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-")
+
+# Počet workerů pro session_store: víc než jeden -> session ve sdíleném SQLite souboru
+os.environ["WEB_CONCURRENCY"] = str(workers)
@@ -0,0 +1,129 @@
+import gzip
+import os
+import threading
+from collections import OrderedDict
+
+from dash.fingerprint import check_fingerprint
+from flask import request
+
+try:
+    import brotli
+except ImportError:      # brotli je volitelný - bez něj se komprimuje jen gzip
+    brotli = None
+
+###############################################################################
+# 1) NASTAVENÍ
+###############################################################################
+COMPRESS_MIN_BYTES = int(os.environ.get("QUIZ_COMPRESS_MIN_BYTES", "1024"))
+ASSET_CACHE_SIZE = 256
+# Jen tyto cesty vrací neměnné soubory -> cache zkomprimovaných dat a nejvyšší úroveň komprese;
+# ostatní GET (stránka, /_dash-layout, /metrics) se komprimují běžně při každém requestu
+STATIC_PREFIXES = ("/assets/", "/_dash-component-suites/")
+
+COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/javascript", "application/geo+json", "image/svg+xml",
+)
+
+###############################################################################
+# 2) LRU CACHE ZKOMPRIMOVANÝCH SOUBORŮ (vlákna gunicorn workeru ji sdílejí)
+###############################################################################
+class _LRU:
+    def __init__(self, size):
+        self.size = size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+
+# Callback odpovědi se necachují: mapa jde v odpovědi quiz_logic (závisí na stavu session)
+# a zbylé deterministické callbacky jsou levnější než parsování a hash těla requestu.
+_compressed_cache = _LRU(ASSET_CACHE_SIZE)    # (etag, kódování) -> zkomprimovaná data statických souborů
+
+###############################################################################
+# 3) KOMPRESE
+###############################################################################
+def _choose_encoding():
+    accepted = request.headers.get("Accept-Encoding", "")
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def _compress(data, encoding, static):
+    # Statické soubory se komprimují jednou (cache) -> můžeme si dovolit nejvyšší úroveň
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if static else 5)
+    return gzip.compress(data, compresslevel=9 if static else 6)
+
+
+def _maybe_compress(response, static):
+    # static = soubor ze STATIC_PREFIXES; ETag (pokud ho odpověď má) dostane příponu kódování
+    if (response.direct_passthrough or response.status_code != 200
+            or "Content-Encoding" in response.headers
+            or not response.mimetype.startswith(COMPRESSIBLE_TYPES)):
+        return
+    response.vary.add("Accept-Encoding")
+    encoding = _choose_encoding()
+    data = response.get_data()
+    if encoding is None or len(data) < COMPRESS_MIN_BYTES:
+        return
+    key = (response.get_etag()[0], encoding) if static else None
+    compressed = _compressed_cache.get(key) if key else None
+    if compressed is None:
+        compressed = _compress(data, encoding, static)
+        if key:
+            _compressed_cache.put(key, compressed)
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    etag = response.get_etag()[0]
+    if etag:
+        # Jiná reprezentace -> jiné (stále silné) ETag
+        response.set_etag(f"{etag}-{encoding}")
+
+###############################################################################
+# 4) CACHE HLAVIČKY A ETAG PRO GET
+###############################################################################
+def _is_versioned_asset():
+    # Dash dává komponentám fingerprint v názvu a vlastním assetům parametr ?m=<mtime>
+    if request.path.startswith("/_dash-component-suites/"):
+        return check_fingerprint(request.path)[1]
+    return request.path.startswith("/assets/") and "m" in request.args
+
+###############################################################################
+# 5) REGISTRACE NA FLASK APLIKACI
+###############################################################################
+def install(app):
+    server = app.server
+
+    @server.after_request
+    def _finalize(response):
+        if response.direct_passthrough and request.path.startswith("/assets/"):
+            # Malé vlastní assety (send_file) načteme do paměti, aby šly komprimovat a cachovat
+            response.direct_passthrough = False
+        conditional = (request.method in ("GET", "HEAD") and response.status_code == 200
+                       and not response.direct_passthrough)
+        static = conditional and request.path.startswith(STATIC_PREFIXES)
+        if conditional:
+            if static and _is_versioned_asset():
+                response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+            if not response.get_etag()[0]:
+                response.add_etag()
+        _maybe_compress(response, static)
+        if conditional:
+            response.make_conditional(request)
+        return response
@@ -0,0 +1,237 @@
+import copy
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from dash import Patch
+
+import country_index
+from artifacts import load_prebuilt_figures
+from country_data import scope_map
+from geo_assets import feature_names, geojson_url
+
+# ~100 zemí x (vlastní kontinent + "Alle") -> stovky figur, vše se vejde do paměti.
+# Všechny cache mají v klíči index dat (CountryIndex) -> po hot-reloadu dat se
+# figury nové verze postaví znovu a staré časem vypadnou z LRU.
+FIGURE_CACHE_SIZE = int(os.environ.get("QUIZ_FIGURE_CACHE_SIZE", "512"))
+BASE_CACHE_SIZE = 64
+# Vlákna pro přípravu figur dopředu (0 = vypnuto, vše se počítá až v requestu)
+PREFETCH_WORKERS = int(os.environ.get("QUIZ_PREFETCH_WORKERS", "1"))
+
+# Pořadí stop: 0 = choropleth kvízu, MICRO_TRACE = markery mikro-států (jen pokud
+# kontinent nějaké má), poslední = okolní země z lokálního GeoJSON (jen s manifestem)
+MICRO_TRACE = 1
+MICRO_TRACE_META = "micro"
+CONTEXT_TRACE_META = "context"
+
+###############################################################################
+# 1) ZÁKLADNÍ FIGURA KONTINENTU (posílá se do prohlížeče jen jednou)
+###############################################################################
+def build_base_figure(cont, data):
+    # plotly.graph_objects se načítá až při první stavbě figury (s předpřipraveným
+    # artefaktem se v běžícím serveru nenačte vůbec)
+    import plotly.graph_objects as go
+
+    locations = data.en_names_by_continent[cont]
+    # Lokální GeoJSON (pokud je sestavený) místo vestavěných map Plotly stahovaných z CDN
+    url = geojson_url(cont)
+    geo_source = dict(geojson=url, featureidkey="properties.name", locationmode="geojson-id") if url else dict(locationmode="country names")
+    # Jediná choropleth stopa s numerickým "z" (0 = šedá, 1 = červená) - zvýraznění
+    # další země je pak jen výměna pole "z", ne nová figura.
+    fig = go.Figure(go.Choropleth(
+        locations=list(locations),
+        z=[0] * len(locations),
+        zmin=0,
+        zmax=1,
+        colorscale=[[0, "lightgrey"], [1, "red"]],
+        showscale=False,
+        hoverinfo="none",            # bez názvu země - ten je odpovědí (i v režimu klikání)
+        **geo_source
+    ))
+    fig.update_layout(title=f"Karte ({cont})", showlegend=False, height=600)
+    fig.update_geos(scope=scope_map.get(cont, "world"))
+
+    # Přidání markerů pro mikro-státy (bez popisků); customdata = ID země pro kliknutí
+    micros = data.micros_by_continent[cont]
+    if micros:
+        fig.add_trace(go.Scattergeo(
+            lon=[data.micro_coords[m][1] for m in micros],
+            lat=[data.micro_coords[m][0] for m in micros],
+            customdata=[data.id_by_de[m] for m in micros],
+            meta=MICRO_TRACE_META,
+            hoverinfo="none",
+            mode="markers",
+            marker=dict(size=[8] * len(micros), color=["black"] * len(micros)),
+            showlegend=False
+        ))
+
+    if url:
+        # Podkladová mapa Plotly se nestahuje; okolní (nehádané) země kreslí poslední stopa
+        quiz_countries = set(locations)
+        context = [name for name in feature_names() if name not in quiz_countries]
+        fig.add_trace(go.Choropleth(
+            locations=context,
+            z=[0] * len(context),
+            colorscale=[[0, "whitesmoke"], [1, "whitesmoke"]],
+            showscale=False,
+            hoverinfo="skip",
+            meta=CONTEXT_TRACE_META,
+            **geo_source
+        ))
+        fig.update_geos(visible=False)
+    return fig
+
+
+def build_placeholder_figure():
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Scatter(x=[0], y=[0], mode="markers"))
+    fig.update_layout(title="Bitte wähle einen Kontinent und starte das Spiel.", xaxis_title="x", yaxis_title="y")
+    return fig
+
+###############################################################################
+# 2) ZVÝRAZNĚNÍ VYBRANÉ ZEMĚ (jen malá data, která se mezi tipy mění)
+###############################################################################
+def build_highlight(chosen_country_de, cont, data):
+    # chosen_country_de=None -> mapa kontinentu bez zvýraznění ve výchozím výřezu
+    micros = data.micros_by_continent[cont]
+    highlight = {
+        "z": [1 if de == chosen_country_de else 0 for de in data.names_by_continent[cont]],
+        "micro_color": ["red" if m == chosen_country_de else "black" for m in micros],
+        "micro_size": [12 if m == chosen_country_de else 8 for m in micros],
+    }
+
+    # Vždy přiblížíme mapu na právě vybranou zemi; střed a zoom má v datech každá
+    # země, takže pomalé fitbounds="locations" v prohlížeči už není potřeba.
+    if chosen_country_de is None:
+        highlight["geo"] = {"fitbounds": False, "center": None, "projection": {"scale": 1}}
+        return highlight
+    lat, lon, scale = data.view_by_continent[cont][chosen_country_de]
+    highlight["geo"] = {"fitbounds": False, "center": {"lat": lat, "lon": lon}, "projection": {"scale": scale}}
+    return highlight
+
+###############################################################################
+# 3) KLIKNUTÍ DO MAPY -> ID ZEMĚ
+###############################################################################
+def resolve_click(click_data, data):
+    # Marker mikro-státu nese ID v customdata, choropleth anglický název v "location";
+    # okolní (nehádané) země z kontextové stopy v indexu nejsou -> None
+    for point in (click_data or {}).get("points", ()):
+        country_id = point.get("customdata")
+        if isinstance(country_id, int) and 0 <= country_id < len(data.names):
+            return country_id
+        if point.get("location") in data.id_by_en:
+            return data.id_by_en[point["location"]]
+    return None
+
+###############################################################################
+# 4) CACHE PODLE KONTINENTU / (KONTINENT, ZEMĚ)
+###############################################################################
+def _to_plain(fig):
+    # Ukládáme už serializovaná (čistě JSON) data - Dash je pak jen zkopíruje do odpovědi
+    # bez validace plotly objektů a bez numpy polí.
+    import plotly.io as pio
+
+    return json.loads(pio.to_json(fig, validate=False))
+
+
+@lru_cache(maxsize=BASE_CACHE_SIZE)
+def _cached_base(data, cont):
+    prebuilt = load_prebuilt_figures(data)
+    if prebuilt and cont in prebuilt["base"]:
+        return prebuilt["base"][cont]
+    return _to_plain(build_base_figure(cont, data))
+
+
+@lru_cache(maxsize=None)
+def _cached_placeholder():
+    prebuilt = load_prebuilt_figures(country_index.current())
+    if prebuilt:
+        return prebuilt["placeholder"]
+    return _to_plain(build_placeholder_figure())
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def _cached_highlight(data, cont, chosen_country_de):
+    return build_highlight(chosen_country_de, cont, data)
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def _cached_figure(data, cont, chosen_country_de):
+    fig = copy.deepcopy(_cached_base(data, cont))
+    highlight = _cached_highlight(data, cont, chosen_country_de)
+    fig["data"][0]["z"] = highlight["z"]
+    # Markery mikro-států hledáme podle meta (uid Plotly při serializaci zahazuje);
+    # kontinent bez mikro-států má na data[1] kontextovou stopu bez "marker"
+    for trace in fig["data"]:
+        if trace.get("meta") == MICRO_TRACE_META:
+            trace["marker"]["color"] = highlight["micro_color"]
+            trace["marker"]["size"] = highlight["micro_size"]
+    geo = fig["layout"].setdefault("geo", {})
+    geo.pop("center", None)
+    for key, value in highlight["geo"].items():
+        if key == "projection":
+            geo.setdefault("projection", {}).update(value)
+        else:
+            geo[key] = value
+    return fig
+
+
+def get_placeholder_figure():
+    return _cached_placeholder()
+
+
+def get_figure(chosen_country_de, chosen_continent, data):
+    return _cached_figure(data, data.continent_key(chosen_continent), chosen_country_de)
+
+
+def get_base_figure(chosen_continent, data):
+    return _cached_base(data, data.continent_key(chosen_continent))
+
+
+def get_highlight(chosen_country_de, chosen_continent, data):
+    return _cached_highlight(data, data.continent_key(chosen_continent), chosen_country_de)
+
+
+def get_patch(chosen_country_de, chosen_continent, data):
+    # Částečná aktualizace figury, která už je v prohlížeči (stejný kontinent):
+    # posílá se jen pole "z", barvy/velikosti markerů a střed/zoom mapy.
+    cont = data.continent_key(chosen_continent)
+    highlight = _cached_highlight(data, cont, chosen_country_de)
+    patch = Patch()
+    patch["data"][0]["z"] = highlight["z"]
+    if highlight["micro_color"]:
+        # Stopa markerů existuje jen s mikro-státy a pak je vždy hned za choroplethem
+        patch["data"][MICRO_TRACE]["marker"]["color"] = highlight["micro_color"]
+        patch["data"][MICRO_TRACE]["marker"]["size"] = highlight["micro_size"]
+    geo = highlight["geo"]
+    patch["layout"]["geo"]["fitbounds"] = geo["fitbounds"]
+    patch["layout"]["geo"]["projection"]["scale"] = geo["projection"]["scale"]
+    patch["layout"]["geo"]["center"] = geo["center"]
+    return patch
+
+
+###############################################################################
+# 5) PŘÍPRAVA ZÁKLADNÍ MAPY NA POZADÍ (během výběru kontinentu)
+###############################################################################
+# Vlákna executoru vznikají až při prvním submit() -> bezpečné i s gunicorn preload
+_prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="quiz-prefetch") if PREFETCH_WORKERS > 0 else None
+
+
+def prefetch(chosen_continent, data):
+    # Jen základní mapa kontinentu (výběr na obrazovce 2); zvýraznění jednotlivých zemí
+    # jsou levné patche nad ní. Vrací Future (nebo None bez poolu)
+    if _prefetch_pool is None:
+        return None
+    return _prefetch_pool.submit(get_base_figure, chosen_continent, data)
+
+
+def warm_figure_cache(data=None):
+    # Předpočítá všechny kombinace (kontinent, země) - volá se jednou při startu serveru
+    data = data or country_index.current()
+    for cont, names in data.names_by_continent.items():
+        for country in names:
+            get_figure(country, cont, data)
+    get_placeholder_figure()
+    return _cached_figure.cache_info().currsize
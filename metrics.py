@@ -0,0 +1,326 @@
+import bisect
+import fcntl
+import functools
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from flask import Response, g, has_request_context, request
+
+from session_store import multiple_workers
+
+###############################################################################
+# 1) NASTAVENÍ
+###############################################################################
+# Každý proces počítá v paměti; při více workerech (gunicorn, uvicorn --workers) každý
+# nejvýš jednou za FLUSH_INTERVAL zapíše snímek svých čítačů do sdíleného adresáře
+# a /metrics sečte snímky všech workerů. Snímky mrtvých workerů (max_requests) se
+# přičtou do archivu, aby čítače nikdy neklesly.
+# QUIZ_METRICS_DIR: adresář snímků ("off" = jen čítače obsluhujícího procesu);
+# výchozí je dočasný adresář podle rodičovského procesu, tj. jeden na běh serveru.
+METRICS_DIR = os.environ.get("QUIZ_METRICS_DIR")
+FLUSH_INTERVAL = 1.0
+METRICS_PATH = os.environ.get("QUIZ_METRICS_PATH", "/metrics")
+METRICS_LOG = os.environ.get("QUIZ_METRICS_LOG") == "1"     # JSON řádek na každý callback request
+DASH_ENDPOINT = "/_dash-update-component"
+
+# Hranice histogramu doby odpovědi (sekundy)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+log = logging.getLogger("quiz.metrics")
+
+###############################################################################
+# 2) ČÍTAČE
+###############################################################################
+class _Histogram:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        index = bisect.bisect_left(LATENCY_BUCKETS, value)
+        if index < len(self.buckets):
+            self.buckets[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+_lock = threading.Lock()
+_duration = defaultdict(_Histogram)        # celý HTTP request callbacku
+_compute = defaultdict(_Histogram)         # jen tělo callback funkce
+_response_bytes = defaultdict(lambda: [0, 0])   # callback -> [count, sum]
+_errors = defaultdict(int)
+_games_started = defaultdict(int)
+_games_finished = defaultdict(int)
+_session_counter = None
+_dirty = False
+_flusher_pid = None
+
+
+def game_started(continent):
+    with _lock:
+        _games_started[continent or "Alle"] += 1
+
+
+def game_finished(continent):
+    with _lock:
+        _games_finished[continent or "Alle"] += 1
+
+
+def timed(func):
+    # Dekorátor pod @app.callback: měří jen výpočet callbacku (bez JSON a Flasku)
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            if has_request_context():
+                g.quiz_callback = func.__name__
+            with _lock:
+                _compute[func.__name__].observe(elapsed)
+    return wrapper
+
+###############################################################################
+# 3) SNÍMKY ČÍTAČŮ PRO VÍCE WORKERŮ
+###############################################################################
+_directory = None
+
+
+def _metrics_dir():
+    # Určuje se až ve workeru (os.getppid() = gunicorn master / hlavní proces uvicornu)
+    global _directory
+    if _directory is None:
+        if METRICS_DIR:
+            directory = "" if METRICS_DIR == "off" else METRICS_DIR
+        elif multiple_workers():
+            directory = os.path.join(tempfile.gettempdir(), f"quiz-metrics-{os.getppid()}")
+        else:
+            directory = ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _directory = directory
+    return _directory or None
+
+
+def _snapshot():
+    # Volá se pod _lock; histogram = [koše..., count, sum]
+    def hist(data):
+        return {name: h.buckets + [h.count, h.sum] for name, h in data.items()}
+    return {
+        "duration": hist(_duration),
+        "compute": hist(_compute),
+        "response_bytes": {name: list(value) for name, value in _response_bytes.items()},
+        "errors": dict(_errors),
+        "games_started": dict(_games_started),
+        "games_finished": dict(_games_finished),
+    }
+
+
+def _merge(total, snapshot):
+    for metric, values in snapshot.items():
+        target = total.setdefault(metric, {})
+        for key, value in values.items():
+            current = target.get(key)
+            if current is None:
+                target[key] = list(value) if isinstance(value, list) else value
+            elif isinstance(value, list):
+                target[key] = [a + b for a, b in zip(current, value)]
+            else:
+                target[key] = current + value
+    return total
+
+
+def _write_json(path, data):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _load_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _flush():
+    # Chyba disku nesmí shodit odpověď ani vlákno zapisovače
+    global _dirty
+    with _lock:
+        _dirty = False
+        data = _snapshot()
+    try:
+        _write_json(os.path.join(_metrics_dir(), f"worker-{os.getpid()}.json"), data)
+    except OSError as exc:
+        log.warning("Metriken nicht geschrieben: %s", exc)
+
+
+def _run_flusher():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        if _dirty:
+            _flush()
+
+
+def _mark_dirty():
+    # Zapisovač se spouští líně v procesu, který obsluhuje requesty (po fork() v každém workeru znovu)
+    global _dirty, _flusher_pid
+    if _metrics_dir() is None:
+        return
+    _dirty = True
+    if _flusher_pid != os.getpid():
+        with _lock:
+            if _flusher_pid != os.getpid():
+                threading.Thread(target=_run_flusher, name="quiz-metrics-flusher", daemon=True).start()
+                _flusher_pid = os.getpid()
+
+
+def _collect():
+    directory = _metrics_dir()
+    if directory is None:
+        with _lock:
+            return _snapshot()
+    _flush()
+    # Zámek: snímky mrtvých workerů přesouvá do archivu jen jeden proces najednou
+    with open(os.path.join(directory, "lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        archive_path = os.path.join(directory, "archive.json")
+        archive = _load_json(archive_path) or {}
+        total, dead = {}, []
+        for path in glob.glob(os.path.join(directory, "worker-*.json")):
+            snapshot = _load_json(path)
+            if snapshot is None:
+                continue
+            pid = int(os.path.basename(path)[len("worker-"):-len(".json")])
+            if _alive(pid):
+                _merge(total, snapshot)
+            else:
+                _merge(archive, snapshot)
+                dead.append(path)
+        if dead:
+            _write_json(archive_path, archive)
+            for path in dead:
+                os.remove(path)
+        return _merge(total, archive)
+
+###############################################################################
+# 4) FLASK HOOKY A ENDPOINT
+###############################################################################
+def _callback_name(app):
+    name = getattr(g, "quiz_callback", None)
+    if name:
+        return name
+    body = request.get_json(silent=True) or {}
+    entry = app.callback_map.get(body.get("output"))
+    return entry["callback"].__name__ if entry else "unknown"
+
+
+def install(app, session_counter=None):
+    global _session_counter
+    _session_counter = session_counter
+    server = app.server
+
+    @server.before_request
+    def _start_timer():
+        if request.path.endswith(DASH_ENDPOINT):
+            g.quiz_request_start = time.perf_counter()
+
+    @server.after_request
+    def _record(response):
+        start = getattr(g, "quiz_request_start", None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        name = _callback_name(app)
+        size = response.calculate_content_length() or 0
+        with _lock:
+            _duration[name].observe(elapsed)
+            counter = _response_bytes[name]
+            counter[0] += 1
+            counter[1] += size
+            if response.status_code >= 500:
+                _errors[name] += 1
+        _mark_dirty()
+        if METRICS_LOG:
+            log.info(json.dumps({
+                "callback": name, "status": response.status_code,
+                "ms": round(elapsed * 1000, 3), "bytes": size,
+            }))
+        return response
+
+    @server.route(METRICS_PATH)
+    def _metrics():
+        return Response(render(), mimetype="text/plain; version=0.0.4")
+
+
+def _label(value):
+    # Escapování hodnoty labelu podle textového formátu Prometheus (zpětné lomítko, uvozovky, konec řádku)
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render():
+    lines = []
+
+    def histogram(metric, help_text, data):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} histogram")
+        for name, values in sorted(data.items()):
+            name = _label(name)
+            *buckets, count, total = values
+            cumulative = 0
+            for bound, bucket in zip(LATENCY_BUCKETS, buckets):
+                cumulative += bucket
+                lines.append(f'{metric}_bucket{{callback="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{callback="{name}",le="+Inf"}} {count}')
+            lines.append(f'{metric}_sum{{callback="{name}"}} {total:.6f}')
+            lines.append(f'{metric}_count{{callback="{name}"}} {count}')
+
+    def counter(metric, help_text, label, data):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for key, value in sorted(data.items()):
+            lines.append(f'{metric}{{{label}="{_label(key)}"}} {value}')
+
+    data = _collect()
+    histogram("quiz_callback_duration_seconds", "Dash callback request time incl. serialization.",
+              data.get("duration", {}))
+    histogram("quiz_callback_compute_seconds", "Time spent inside the callback function.", data.get("compute", {}))
+    lines.append("# HELP quiz_callback_response_bytes Callback response size as sent (after compression).")
+    lines.append("# TYPE quiz_callback_response_bytes summary")
+    for name, (count, total) in sorted(data.get("response_bytes", {}).items()):
+        lines.append(f'quiz_callback_response_bytes_sum{{callback="{_label(name)}"}} {total}')
+        lines.append(f'quiz_callback_response_bytes_count{{callback="{_label(name)}"}} {count}')
+    counter("quiz_callback_errors_total", "Callback requests answered with 5xx.", "callback", data.get("errors", {}))
+    counter("quiz_games_started_total", "Games started per continent.", "continent", data.get("games_started", {}))
+    counter("quiz_games_finished_total", "Games finished per continent.", "continent",
+            data.get("games_finished", {}))
+
+    if _session_counter is not None:
+        lines.append("# HELP quiz_active_sessions Quiz sessions that have not expired.")
+        lines.append("# TYPE quiz_active_sessions gauge")
+        lines.append(f"quiz_active_sessions {_session_counter()}")
+    return "\n".join(lines) + "\n"
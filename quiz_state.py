@@ -0,0 +1,208 @@
+import base64
+import random
+from array import array
+from bisect import bisect_left
+
+from weighted_pool import FenwickTree, pack_tree, unpack_tree
+
+###############################################################################
+# 1) KÓDOVÁNÍ: BITMASKA HOTOVÝCH ZEMÍ + POLE ZBÝVAJÍCÍCH ID
+###############################################################################
+# Stav kvízu je dict s malými čísly, base64 bitmaskami a poli ID; ID zemí platí
+# v rámci verze dat "data", se kterou hra začala (viz country_index.get):
+#   "done" - bitmaska (bit i = země s ID i už byla hádána), posílá se i prohlížeči
+#   "pool" - uint16 pole ID zemí, které ještě nebyly vylosovány (bez aktuální a další země)
+#   "missed" - bitmaska zemí, na které byl poslední tip v session špatně (přenáší se do další hry)
+# Další země ("next") je vylosovaná o krok dopředu (mapy všech zemí jsou stejně předpočítané).
+# Adaptivní hra místo "pool" drží "order" (uint16 ID kandidátů vzestupně) a "tree"
+# (Fenwickův strom jejich vah, viz weighted_pool) - vylosovaná země má váhu 0.
+# Pole zůstávají rozbalená (array / FenwickTree), dokud stav žije v paměti procesu;
+# do JSON (SQLite session) je převede dump_state, zpět load_state.
+
+# Váha, se kterou se špatně zodpovězená země v adaptivní hře vrátí do losování
+# (jednou za hru; vyšší než běžné váhy -> objeví se brzy, ale ne hned jako další)
+REPEAT_WEIGHT = 120
+
+def encode_mask(ids):
+    mask = 0
+    for country_id in ids:
+        mask |= 1 << country_id
+    return base64.b64encode(mask.to_bytes((mask.bit_length() + 7) // 8, "little")).decode("ascii")
+
+
+def decode_mask(text):
+    mask = int.from_bytes(base64.b64decode(text), "little")
+    ids = []
+    country_id = 0
+    while mask:
+        if mask & 1:
+            ids.append(country_id)
+        mask >>= 1
+        country_id += 1
+    return ids
+
+
+def _mask_add(text, country_id):
+    mask = int.from_bytes(base64.b64decode(text), "little") | (1 << country_id)
+    return base64.b64encode(mask.to_bytes((mask.bit_length() + 7) // 8, "little")).decode("ascii")
+
+
+def _mask_remove(text, country_id):
+    mask = int.from_bytes(base64.b64decode(text), "little") & ~(1 << country_id)
+    return base64.b64encode(mask.to_bytes((mask.bit_length() + 7) // 8, "little")).decode("ascii")
+
+
+def _mask_has(text, country_id):
+    return bool(int.from_bytes(base64.b64decode(text), "little") >> country_id & 1)
+
+
+def pack_ids(ids):
+    return base64.b64encode(array("H", ids).tobytes()).decode("ascii")
+
+
+def unpack_ids(text):
+    ids = array("H")
+    ids.frombytes(base64.b64decode(text))
+    return ids
+
+
+def dump_state(state):
+    # Stav -> čisté JSON (pole jako base64); None a hotové JSON projdou beze změny
+    if state is None:
+        return None
+    state = dict(state)
+    for key in ("pool", "order"):
+        if isinstance(state.get(key), array):
+            state[key] = pack_ids(state[key])
+    if isinstance(state.get("tree"), FenwickTree):
+        state["tree"] = pack_tree(state["tree"])
+    return state
+
+
+def load_state(state):
+    if state is None:
+        return None
+    state = dict(state)
+    for key in ("pool", "order"):
+        if isinstance(state.get(key), str):
+            state[key] = unpack_ids(state[key])
+    if isinstance(state.get("tree"), str):
+        state["tree"] = unpack_tree(state["tree"])
+    return state
+
+###############################################################################
+# 2) LOSOVÁNÍ: ROVNOMĚRNĚ V O(1) (PROHOZENÍ S POSLEDNÍM), PODLE VAH V O(log n)
+###############################################################################
+def _draw(pool, rng):
+    if not pool:
+        return None
+    i = rng.randrange(len(pool))
+    pool[i], pool[-1] = pool[-1], pool[i]
+    return pool.pop()
+
+
+def _draw_weighted(order, tree, rng):
+    # Adaptivní varianta: pozice úměrně váze v O(log n), pak váha 0 (země je vylosovaná)
+    pos = tree.sample(rng)
+    if pos is None:
+        return None
+    tree.set(pos, 0)
+    return order[pos]
+
+###############################################################################
+# 3) PŘECHODY STAVU
+###############################################################################
+def new_state(data, chosen_continent, now, rng=random, ids=None, weights=None, missed=()):
+    # ids: podmnožina zemí kontinentu, ze kterých se losuje (výchozí = všechny)
+    # weights: kladné celočíselné váhy k ids -> adaptivní losování; missed: převzatá bitmaska
+    if ids is None:
+        ids = data.ids_by_continent[data.continent_key(chosen_continent)]
+    state = {
+        "data": data.version,
+        "continent": chosen_continent,
+        "correct": 0,
+        "wrong": 0,
+        "done": encode_mask(()),
+        "missed": encode_mask(missed),
+        "start": now,
+    }
+    if weights is None:
+        pool = array("H", ids)
+        state["current"] = _draw(pool, rng)
+        state["next"] = _draw(pool, rng)
+        state["pool"] = pool
+    else:
+        order = array("H", sorted(ids))
+        weight_by_id = dict(zip(ids, weights))
+        tree = FenwickTree.build(weight_by_id[i] for i in order)
+        state["current"] = _draw_weighted(order, tree, rng)
+        state["next"] = _draw_weighted(order, tree, rng)
+        state["order"] = order
+        state["tree"] = tree
+        state["repeated"] = encode_mask(())
+    return state
+
+
+def answer(state, guess_id, rng=random):
+    # Vyhodnotí tip na aktuální zemi, posune frontu a vylosuje další; vrací (nový stav, správně?)
+    current = state["current"]
+    correct = guess_id == current
+    state = dict(state)
+    state["correct" if correct else "wrong"] += 1
+    if "missed" in state:
+        state["missed"] = (_mask_remove if correct else _mask_add)(state["missed"], current)
+    if "tree" in state:
+        return _answer_weighted(state, current, correct, rng), correct
+    # Kopie pole (memcpy) - stav, ze kterého se vychází, zůstává nezměněný
+    pool = state["pool"][:]
+    state["done"] = _mask_add(state["done"], current)
+    state["current"] = state["next"]
+    state["next"] = _draw(pool, rng)
+    state["pool"] = pool
+    return state, correct
+
+
+def _answer_weighted(state, current, correct, rng):
+    order = state["order"]
+    tree = state["tree"].copy()
+    if correct or _mask_has(state["repeated"], current):
+        state["done"] = _mask_add(state["done"], current)
+    else:
+        # Špatně poprvé -> země se vrátí do losování (pozici najde bisect, order je seřazený)
+        tree.set(bisect_left(order, current), REPEAT_WEIGHT)
+        state["repeated"] = _mask_add(state["repeated"], current)
+    # Další otázka už je vylosovaná (next); jen u poslední země se losuje hned
+    state["current"] = state["next"] if state["next"] is not None else _draw_weighted(order, tree, rng)
+    state["next"] = _draw_weighted(order, tree, rng)
+    state["tree"] = tree
+    return state
+
+
+def remaining_ids(state):
+    # Zbývající země včetně právě hádané a další, v pořadí datové sady
+    if "tree" in state:
+        order = state["order"]
+        ids = [order[pos] for pos, weight in enumerate(state["tree"].weights()) if weight]
+    else:
+        ids = list(state["pool"])
+    ids.extend(i for i in (state["current"], state["next"]) if i is not None)
+    return sorted(ids)
+
+
+def done_ids(state):
+    return decode_mask(state["done"])
+
+
+def missed_ids(state):
+    return decode_mask(state.get("missed") or encode_mask(()))
+
+
+def is_repeat(state, country_id):
+    # Země se v adaptivní hře ptá podruhé (po první chybě) - do statistik zemí se nepočítá
+    return "repeated" in state and _mask_has(state["repeated"], country_id)
+
+
+def undone_ids(data, chosen_continent, done):
+    # Zbývající země jen z kontinentu a bitmasky (bez poolu) - stačí na zobrazení
+    mask = int.from_bytes(base64.b64decode(done), "little")
+    return [i for i in data.ids_by_continent[data.continent_key(chosen_continent)] if not mask >> i & 1]
@@ -0,0 +1,277 @@
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+###############################################################################
+# 1) NASTAVENÍ
+###############################################################################
+# QUIZ_RESULTS_DB: cesta k SQLite souboru s výsledky, "off" = výsledky se neukládají
+RESULTS_DB = os.environ.get(
+    "QUIZ_RESULTS_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.db")
+)
+FLUSH_INTERVAL = float(os.environ.get("QUIZ_RESULTS_FLUSH_INTERVAL", "1.0"))  # nejdéle s do zápisu
+BATCH_SIZE = 500            # kolik událostí nejvýš v jedné transakci
+QUEUE_SIZE = 10000          # plná fronta = událost se zahodí, tip nikdy nečeká na disk
+LEADERBOARD_SIZE = 20       # kolik nejlepších her držet pro každý kontinent a režim
+MIN_ATTEMPTS = 5            # země s méně pokusy se do "nejtěžších" nepočítají
+RATES_TTL = 30.0            # jak dlouho (s) platí načtená chybovost pro adaptivní výběr
+
+log = logging.getLogger("quiz.results")
+
+SCHEMA = (
+    # Dohrané hry (historie, nikdy se nečte celá); adaptive = hra s opakováním chyb
+    "CREATE TABLE IF NOT EXISTS games ("
+    " id INTEGER PRIMARY KEY, finished_at REAL NOT NULL, continent TEXT NOT NULL, mode TEXT NOT NULL,"
+    " data_version TEXT, correct INTEGER NOT NULL, wrong INTEGER NOT NULL, seconds REAL NOT NULL,"
+    " adaptive INTEGER NOT NULL DEFAULT 0)",
+    # Agregát: jen LEADERBOARD_SIZE nejlepších her na (kontinent, režim, adaptivní)
+    "CREATE TABLE IF NOT EXISTS leaderboard ("
+    " game_id INTEGER PRIMARY KEY, continent TEXT NOT NULL, mode TEXT NOT NULL, finished_at REAL NOT NULL,"
+    " correct INTEGER NOT NULL, wrong INTEGER NOT NULL, seconds REAL NOT NULL,"
+    " adaptive INTEGER NOT NULL DEFAULT 0)",
+    "CREATE INDEX IF NOT EXISTS leaderboard_board"
+    " ON leaderboard (continent, mode, adaptive, correct DESC, wrong, seconds)",
+    # Agregát: počty pokusů a chyb na zemi a režim, chybovost uložená kvůli indexu
+    "CREATE TABLE IF NOT EXISTS country_stats ("
+    " country TEXT NOT NULL, mode TEXT NOT NULL, attempts INTEGER NOT NULL, errors INTEGER NOT NULL,"
+    " error_rate REAL NOT NULL, PRIMARY KEY (country, mode))",
+    "CREATE INDEX IF NOT EXISTS country_stats_rate ON country_stats (mode, error_rate DESC, attempts DESC)",
+)
+
+# Úpravy databází ze starších verzí (tabulka, sloupec, definice); běží před SCHEMA
+MIGRATIONS = (
+    ("games", "adaptive", "INTEGER NOT NULL DEFAULT 0"),
+    ("leaderboard", "adaptive", "INTEGER NOT NULL DEFAULT 0"),
+)
+OBSOLETE_INDEXES = ("leaderboard_rank",)
+
+
+def _migrate(conn):
+    for table, column, definition in MIGRATIONS:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if columns and column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    for index in OBSOLETE_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {index}")
+
+###############################################################################
+# 2) ÚLOŽIŠTĚ: ZÁPIS NA POZADÍ (write-behind fronta, dávkové transakce) A DOTAZY
+###############################################################################
+# Callbacky jen vloží událost do fronty (O(1), bez zámku databáze); jedno vlákno
+# na proces ji vybírá po dávkách, odpovědi sečte v paměti a celou dávku zapíše
+# v jedné transakci včetně inkrementální úpravy agregátů.
+class ResultsStore:
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._local = threading.local()
+        self._writer = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._rates = {}                # režim -> (platí do, {země: (pokusy, chyby)})
+        # Schéma přes dočasné spojení - store může vzniknout v gunicorn masteru
+        # a SQLite spojení ani vlákno writeru se nesmí sdílet přes fork()
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                _migrate(conn)
+                for statement in SCHEMA:
+                    conn.execute(statement)
+        finally:
+            conn.close()
+        atexit.register(self.close)
+
+    def record_answer(self, country, mode, correct):
+        self._put(("answer", country, mode, bool(correct)))
+
+    def record_game(self, continent, mode, data_version, correct, wrong, seconds, adaptive=False,
+                    finished_at=None):
+        self._put(("game", time.time() if finished_at is None else finished_at,
+                   continent, mode, data_version, correct, wrong, round(seconds, 1), int(bool(adaptive))))
+
+    def _put(self, event):
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_writer(self):
+        # Writer se spouští líně v procesu, který zapisuje (po fork() v každém workeru znovu)
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+                self._writer = threading.Thread(target=self._run, name="quiz-results-writer", daemon=True)
+                self._writer.start()
+                self._pid = os.getpid()
+
+    def _run(self):
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        events_queue = self._queue
+        stop = False
+        while not stop:
+            batch = [events_queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                try:
+                    batch.append(events_queue.get(timeout=timeout) if timeout > 0 else events_queue.get_nowait())
+                except queue.Empty:
+                    break
+            waiters = [e for e in batch if e[0] in ("flush", "stop")]
+            stop = any(e[0] == "stop" for e in waiters)
+            try:
+                self._write(conn, [e for e in batch if e[0] not in ("flush", "stop")])
+            except sqlite3.Error as exc:
+                # Výsledky jsou "best effort" - chyba databáze nesmí shodit hru
+                log.warning("Ergebnisse nicht gespeichert (%d Ereignisse): %s", len(batch) - len(waiters), exc)
+            for event in waiters:
+                event[1].set()
+        conn.close()
+
+    def _write(self, conn, events):
+        if not events:
+            return
+        # Odpovědi se sečtou v paměti -> jeden UPSERT na zemi a režim za dávku
+        counts = defaultdict(lambda: [0, 0])
+        games = []
+        for event in events:
+            if event[0] == "answer":
+                _, country, mode, correct = event
+                item = counts[(country, mode)]
+                item[0] += 1
+                item[1] += not correct
+            else:
+                games.append(event[1:])
+        with conn:
+            conn.executemany(
+                "INSERT INTO country_stats (country, mode, attempts, errors, error_rate) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (country, mode) DO UPDATE SET"
+                " attempts = attempts + excluded.attempts, errors = errors + excluded.errors,"
+                " error_rate = CAST(errors + excluded.errors AS REAL) / (attempts + excluded.attempts)",
+                [(country, mode, a, e, e / a) for (country, mode), (a, e) in counts.items()]
+            )
+            boards = set()
+            for finished_at, continent, mode, data_version, correct, wrong, seconds, adaptive in games:
+                game_id = conn.execute(
+                    "INSERT INTO games (finished_at, continent, mode, data_version, correct, wrong, seconds, adaptive)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (finished_at, continent, mode, data_version, correct, wrong, seconds, adaptive)
+                ).lastrowid
+                conn.execute(
+                    "INSERT INTO leaderboard (game_id, continent, mode, finished_at, correct, wrong, seconds, adaptive)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (game_id, continent, mode, finished_at, correct, wrong, seconds, adaptive)
+                )
+                boards.add((continent, mode, adaptive))
+            # Oříznutí žebříčku na LEADERBOARD_SIZE - čte jen pár řádků přes index
+            for board in boards:
+                conn.execute(
+                    "DELETE FROM leaderboard WHERE continent = ? AND mode = ? AND adaptive = ? AND game_id NOT IN ("
+                    " SELECT game_id FROM leaderboard WHERE continent = ? AND mode = ? AND adaptive = ?"
+                    " ORDER BY correct DESC, wrong, seconds LIMIT ?)",
+                    board + board + (LEADERBOARD_SIZE,)
+                )
+
+    def flush(self, timeout=10.0):
+        # Počká, až je zapsáno vše, co bylo ve frontě před voláním (benchmarky, CLI, konec procesu)
+        if self._pid != os.getpid():
+            return True
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self, timeout=10.0):
+        if self._pid != os.getpid() or not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(("stop", done))
+        done.wait(timeout)
+        self._pid = None
+
+    # Dotazy čtou jen agregáty (žádný průchod historií her); WAL = čtení neblokuje writer
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def leaderboard(self, continent, mode, limit=10, adaptive=False):
+        # Adaptivní hry (chyby se opakují) mají vlastní žebříček - skóre není srovnatelné
+        rows = self._connect().execute(
+            "SELECT correct, wrong, seconds, finished_at FROM leaderboard"
+            " WHERE continent = ? AND mode = ? AND adaptive = ?"
+            " ORDER BY correct DESC, wrong, seconds LIMIT ?",
+            (continent, mode, int(bool(adaptive)), min(limit, LEADERBOARD_SIZE))
+        ).fetchall()
+        return [{"correct": c, "wrong": w, "seconds": s, "finished_at": f} for c, w, s, f in rows]
+
+    def error_rates(self, mode):
+        # Chybovost všech zemí režimu pro váhy adaptivního výběru; krátká cache v procesu,
+        # aby start hry nečetl databázi pokaždé
+        now = time.monotonic()
+        cached = self._rates.get(mode)
+        if cached and cached[0] > now:
+            return cached[1]
+        rates = {
+            country: (attempts, errors) for country, attempts, errors in self._connect().execute(
+                "SELECT country, attempts, errors FROM country_stats WHERE mode = ?", (mode,)
+            )
+        }
+        self._rates[mode] = (now + RATES_TTL, rates)
+        return rates
+
+    def hardest(self, mode, limit=10, countries=None, min_attempts=MIN_ATTEMPTS):
+        # countries = volitelné omezení (např. země kontinentu); filtruje se v Pythonu,
+        # index vrací řádky už seřazené podle chybovosti
+        rows = self._connect().execute(
+            "SELECT country, attempts, errors, error_rate FROM country_stats"
+            " WHERE mode = ? AND attempts >= ? ORDER BY error_rate DESC, attempts DESC",
+            (mode, min_attempts)
+        )
+        result = []
+        for country, attempts, errors, rate in rows:
+            if countries is None or country in countries:
+                result.append({"country": country, "attempts": attempts, "errors": errors, "error_rate": rate})
+                if len(result) >= limit:
+                    break
+        return result
+
+###############################################################################
+# 3) VÝBĚR ÚLOŽIŠTĚ
+###############################################################################
+def create_store(spec=None):
+    spec = spec or RESULTS_DB
+    if spec == "off":
+        return None
+    return ResultsStore(spec)
+
+
+if __name__ == "__main__":
+    # python results.py [kontinent] [režim] [adaptive] - výpis žebříčku a nejtěžších zemí
+    import sys
+
+    store = create_store()
+    if store is None:
+        sys.exit("QUIZ_RESULTS_DB=off")
+    continent = sys.argv[1] if len(sys.argv) > 1 else "Alle"
+    mode = sys.argv[2] if len(sys.argv) > 2 else "map"
+    adaptive = len(sys.argv) > 3 and sys.argv[3] == "adaptive"
+    print(f"Bestenliste {continent} ({mode}{', Üben' if adaptive else ''}):")
+    for rank, row in enumerate(store.leaderboard(continent, mode, adaptive=adaptive), start=1):
+        print(f"{rank:3d}. {row['correct']} richtig, {row['wrong']} falsch, {row['seconds']:.0f} s")
+    print(f"Schwierigste Länder ({mode}):")
+    for row in store.hardest(mode):
+        print(f"  {row['country']}: {row['error_rate']:.0%} Fehler ({row['attempts']} Versuche)")
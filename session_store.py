@@ -0,0 +1,164 @@
+import json
+import multiprocessing
+import os
+import secrets
+import sqlite3
+import tempfile
+import threading
+import time
+
+###############################################################################
+# 1) NASTAVENÍ
+###############################################################################
+# QUIZ_SESSION_BACKEND: "memory" (jeden proces) nebo "sqlite:///cesta/k/souboru.db"
+# (sdílené mezi více workery na jednom stroji). Bez nastavení rozhoduje počet procesů.
+def multiple_workers():
+    # gunicorn.conf.py exportuje WEB_CONCURRENCY; uvicorn --workers N spouští workery
+    # přes multiprocessing (spawn) -> worker má rodičovský proces multiprocessing
+    if int(os.environ.get("WEB_CONCURRENCY", "1")) > 1:
+        return True
+    return multiprocessing.parent_process() is not None
+
+
+def default_backend_spec():
+    # Session v paměti jednoho procesu by se mezi workery ztrácely -> sdílený SQLite soubor
+    if multiple_workers():
+        return "sqlite:///" + os.path.join(tempfile.gettempdir(), "quiz-sessions.db")
+    return "memory"
+
+
+SESSION_BACKEND = os.environ.get("QUIZ_SESSION_BACKEND") or default_backend_spec()
+SESSION_TTL = int(os.environ.get("QUIZ_SESSION_TTL", "7200"))   # sekundy nečinnosti do smazání
+PURGE_INTERVAL = 60                                               # jak často mazat prošlé session
+
+
+def new_token():
+    # Krátký náhodný token - jediná věc o session, která putuje do prohlížeče
+    return secrets.token_urlsafe(12)
+
+###############################################################################
+# 2) BACKEND V PAMĚTI PROCESU (dict + TTL)
+###############################################################################
+class MemorySessionBackend:
+    def __init__(self, ttl=SESSION_TTL):
+        self.ttl = ttl
+        self._data = {}                 # token -> (expires_at, state)
+        self._lock = threading.Lock()
+        self._next_purge = 0.0
+
+    def get(self, token):
+        now = time.time()
+        with self._lock:
+            item = self._data.get(token)
+            if item is None:
+                return None
+            expires_at, state = item
+            if expires_at < now:
+                del self._data[token]
+                return None
+            # Prodloužení platnosti při každém přístupu
+            self._data[token] = (now + self.ttl, state)
+            return dict(state)
+
+    def set(self, token, state):
+        now = time.time()
+        with self._lock:
+            self._data[token] = (now + self.ttl, dict(state))
+            if now >= self._next_purge:
+                self._purge(now)
+
+    def delete(self, token):
+        with self._lock:
+            self._data.pop(token, None)
+
+    def count(self):
+        now = time.time()
+        with self._lock:
+            return sum(1 for expires_at, _ in self._data.values() if expires_at >= now)
+
+    def _purge(self, now):
+        expired = [token for token, (expires_at, _) in self._data.items() if expires_at < now]
+        for token in expired:
+            del self._data[token]
+        self._next_purge = now + PURGE_INTERVAL
+
+###############################################################################
+# 3) BACKEND V SQLITE (sdílený soubor pro více procesů)
+###############################################################################
+class SQLiteSessionBackend:
+    def __init__(self, path, ttl=SESSION_TTL, dump=None, load=None):
+        # dump/load: převod stavu na čisté JSON a zpět (paměťový backend drží stav tak, jak je)
+        self.path = path
+        self.ttl = ttl
+        self._dump = dump or (lambda state: state)
+        self._load = load or (lambda state: state)
+        self._local = threading.local()
+        self._next_purge = 0.0
+        # Schéma přes dočasné spojení - backend může vzniknout v gunicorn masteru
+        # a SQLite spojení se nesmí sdílet přes fork()
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS sessions ("
+                    " token TEXT PRIMARY KEY, expires_at REAL NOT NULL, state TEXT NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires_at)")
+        finally:
+            conn.close()
+
+    def _connect(self):
+        # Jedno spojení na vlákno; WAL dovolí souběžné čtení z více workerů
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, token):
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT state FROM sessions WHERE token = ? AND expires_at >= ?", (token, now)
+        ).fetchone()
+        if row is None:
+            return None
+        with conn:
+            conn.execute("UPDATE sessions SET expires_at = ? WHERE token = ?", (now + self.ttl, token))
+        return self._load(json.loads(row[0]))
+
+    def set(self, token, state):
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (token, expires_at, state) VALUES (?, ?, ?)",
+                (token, now + self.ttl, json.dumps(self._dump(state), separators=(",", ":")))
+            )
+            if now >= self._next_purge:
+                conn.execute("DELETE FROM sessions WHERE expires_at < ?", (now,))
+                self._next_purge = now + PURGE_INTERVAL
+
+    def delete(self, token):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+
+    def count(self):
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM sessions WHERE expires_at >= ?", (time.time(),)
+        ).fetchone()
+        return row[0]
+
+###############################################################################
+# 4) VÝBĚR BACKENDU
+###############################################################################
+def create_backend(spec=None, ttl=SESSION_TTL, dump=None, load=None):
+    spec = spec or SESSION_BACKEND
+    if spec == "memory":
+        return MemorySessionBackend(ttl=ttl)
+    if spec.startswith("sqlite:///"):
+        return SQLiteSessionBackend(spec[len("sqlite:///"):], ttl=ttl, dump=dump, load=load)
+    raise ValueError(f"Unbekanntes Session-Backend: {spec!r}")
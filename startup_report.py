@@ -0,0 +1,63 @@
+import argparse
+import subprocess
+import sys
+import time
+
+###############################################################################
+# REPORT ČASU STARTU (python -X importtime) PRO HLÍDÁNÍ REGRESÍ
+###############################################################################
+# python startup_report.py [--module guess] [--top 15] [--max-ms 1500]
+HEAVY_MODULES = ("pandas", "numpy", "plotly.graph_objs", "plotly.express")
+
+
+def measure(module):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        sys.exit(proc.stderr)
+
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), depth, int(self_us) / 1000, int(cumulative_us) / 1000))
+    return wall_ms, imports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time report for the quiz app")
+    parser.add_argument("--module", default="guess")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if importing the module takes longer")
+    args = parser.parse_args(argv)
+
+    wall_ms, imports = measure(args.module)
+    target = next((ms for name, _, _, ms in imports if name == args.module), 0.0)
+    print(f"Process wall time: {wall_ms:8.1f} ms")
+    print(f"import {args.module}:   {target:8.1f} ms (cumulative)")
+    print()
+    print(f"Top {args.top} direct imports by cumulative time:")
+    # Přímé importy = o úroveň hlouběji než měřený modul (a nejvyšší úroveň interpretu)
+    direct = [item for item in imports if item[1] <= 1]
+    for name, _, self_ms, cumulative_ms in sorted(direct, key=lambda item: -item[3])[:args.top]:
+        print(f"  {cumulative_ms:8.1f} ms  (self {self_ms:6.1f})  {name}")
+
+    loaded = {name for name, _, _, _ in imports}
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+    print()
+    print("Heavy modules loaded at import: " + (", ".join(heavy) if heavy else "none"))
+
+    if args.max_ms is not None and target > args.max_ms:
+        print(f"FAIL: import {args.module} took {target:.1f} ms > {args.max_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
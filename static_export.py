@@ -0,0 +1,113 @@
+import json
+import os
+import shutil
+import sys
+
+import plotly
+
+import country_index
+import game_engine
+import quiz_state
+import results
+from geo_assets import GEO_DIR, GEO_URL_PREFIX, load_manifest
+from map_figures import get_base_figure, get_highlight, get_placeholder_figure
+
+###############################################################################
+# STATICKÝ EXPORT CELÉHO KVÍZU (python static_export.py [výstupní_adresář])
+###############################################################################
+# Výsledek běží čistě v prohlížeči a stačí mu libovolný statický server / CDN:
+#   index.html, style.css, quiz.js   - ze static_site/
+#   plotly.min.js                    - z balíčku plotly (žádné CDN)
+#   data/countries.json              - názvy zemí a hlavních měst, ID podle kontinentu, režimy,
+#                                      váhy adaptivního výběru, seznam figur
+#   figures/<n>.json                 - základní figura kontinentu + zvýraznění každé země
+#                                      a pohled bez zvýraznění (režim "klik do mapy")
+#   geo/...                          - lokální GeoJSON, pokud je sestavený (geo_assets.py)
+# Všechny režimy i adaptivní výběr běží stejně jako na serveru; chybovost zemí je jen
+# snímek z results.db v době exportu (bez něj váží jen chyby hráče v téže stránce),
+# žebříček statická verze nemá.
+SITE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static_site")
+DEFAULT_OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dist")
+
+
+def _write_json(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"), ensure_ascii=False)
+
+
+def _relative_geo_urls(figure):
+    # "/geo/..." z Flask route -> relativní cesta, aby export fungoval i v podadresáři
+    for trace in figure["data"]:
+        if isinstance(trace.get("geojson"), str) and trace["geojson"].startswith(GEO_URL_PREFIX):
+            trace["geojson"] = "geo/" + trace["geojson"][len(GEO_URL_PREFIX):]
+    return figure
+
+
+def _error_rates(data):
+    # Snímek chybovosti {režim: {id: [pokusy, chyby]}}; bez existující databáze prázdný
+    if results.RESULTS_DB == "off" or not os.path.exists(results.RESULTS_DB):
+        return {}
+    store = results.create_store()
+    rates = {}
+    for mode in game_engine.MODES:
+        rates[mode] = {
+            data.id_by_de[country]: list(counts)
+            for country, counts in store.error_rates(mode).items() if country in data.id_by_de
+        }
+    return rates
+
+
+def export(out_dir=DEFAULT_OUT):
+    if os.path.exists(out_dir):
+        shutil.rmtree(out_dir)
+    shutil.copytree(SITE_DIR, out_dir)
+    shutil.copy(os.path.join(os.path.dirname(plotly.__file__), "package_data", "plotly.min.js"), out_dir)
+
+    data = country_index.current()
+    figure_files = {}
+    for i, cont in enumerate(data.names_by_continent):
+        figure_files[cont] = f"figures/{i}.json"
+        _write_json(os.path.join(out_dir, figure_files[cont]), {
+            "base": _relative_geo_urls(json.loads(json.dumps(get_base_figure(cont, data)))),
+            "highlights": {name: get_highlight(name, cont, data) for name in data.names_by_continent[cont]},
+            "plain": get_highlight(None, cont, data),
+        })
+    _write_json(os.path.join(out_dir, "figures", "placeholder.json"), get_placeholder_figure())
+
+    _write_json(os.path.join(out_dir, "data", "countries.json"), {
+        "version": data.version,
+        "names": list(data.names),
+        "en_names": [data.en_by_de[name] for name in data.names],
+        "capitals": [data.capital_by_de.get(name) for name in data.names],
+        "continents": {cont: list(ids) for cont, ids in data.ids_by_continent.items()},
+        "modes": {
+            name: {"labels": mode.labels, "highlight": mode.highlight, "input": mode.input}
+            for name, mode in game_engine.MODES.items()
+        },
+        "default_mode": game_engine.DEFAULT_MODE,
+        "adaptive": {
+            "base": game_engine.BASE_WEIGHT,
+            "error": game_engine.ERROR_WEIGHT,
+            "missed": game_engine.MISSED_WEIGHT,
+            "repeat": quiz_state.REPEAT_WEIGHT,
+            "rates": _error_rates(data),
+        },
+        "dropdown": [country_index.ALL] + list(data.continents),
+        "figures": figure_files,
+        "placeholder": "figures/placeholder.json",
+    })
+
+    manifest = load_manifest()
+    if manifest:
+        os.makedirs(os.path.join(out_dir, "geo"), exist_ok=True)
+        for filename in manifest["levels"].values():
+            for suffix in ("", ".gz", ".br"):
+                source = os.path.join(GEO_DIR, filename + suffix)
+                if os.path.exists(source):
+                    shutil.copy(source, os.path.join(out_dir, "geo"))
+    return out_dir
+
+
+if __name__ == "__main__":
+    print(export(*sys.argv[1:2]))
@@ -0,0 +1,340 @@
+// Statická verze kvízu: stejný průběh jako guess.py (všechny režimy i adaptivní výběr),
+// ale celý v prohlížeči. Data (data/countries.json) a figury (figures/*.json) vyrábí
+// `python static_export.py`.
+(function () {
+    "use strict";
+
+    var data = null;            // názvy zemí, ID podle kontinentu, soubory figur
+    var figures = {};           // kontinent -> Promise({base, highlights})
+    var shownContinent = null;  // kontinent, jehož základní mapa je nakreslená
+    var state = null;           // stav hry
+    var missed = {};            // země s posledním špatným tipem - přenáší se do další hry
+
+    var PROMPTS = {
+        map: "Welches Land ist rot markiert?",
+        capital: "Wie heißt die Hauptstadt des rot markierten Landes?",
+        reverse: "Wo liegt {country}? Klicke das Land auf der Karte an."
+    };
+
+    function $(id) {
+        return document.getElementById(id);
+    }
+
+    function fetchJSON(url) {
+        return fetch(url).then(function (response) { return response.json(); });
+    }
+
+    function clone(obj) {
+        return JSON.parse(JSON.stringify(obj));
+    }
+
+    function showScreen(screen) {
+        for (var i = 1; i <= 3; i++) {
+            $("screen-" + i).classList.toggle("hidden", i !== screen);
+        }
+    }
+
+    function fillSelect(select, options, placeholder) {
+        select.innerHTML = "";
+        var empty = document.createElement("option");
+        empty.value = "";
+        empty.textContent = placeholder || "";
+        select.appendChild(empty);
+        options.forEach(function (option) {
+            var el = document.createElement("option");
+            el.value = option.value;
+            el.textContent = option.label;
+            select.appendChild(el);
+        });
+    }
+
+    ///////////////////////////////////////////////////////////////////////////
+    // MAPA: základní figura kontinentu jednou, pak jen restyle/relayout
+    ///////////////////////////////////////////////////////////////////////////
+    function continentFigures(continent) {
+        if (!figures[continent]) {
+            figures[continent] = fetchJSON(data.figures[continent]);
+        }
+        return figures[continent];
+    }
+
+    function microTrace(map) {
+        // Markery mikro-států se hledají podle meta (viz map_figures.MICRO_TRACE_META)
+        for (var i = 0; i < map.data.length; i++) {
+            if (map.data[i].meta === "micro") {
+                return i;
+            }
+        }
+        return -1;
+    }
+
+    function drawMap(continent, countryId, highlighted) {
+        var map = $("blind-map");
+        if (countryId === null) {
+            shownContinent = null;
+            return fetchJSON(data.placeholder).then(function (fig) {
+                Plotly.react(map, fig.data, fig.layout);
+            });
+        }
+        return continentFigures(continent).then(function (fig) {
+            // Režim bez zvýraznění (hráč zemi hledá sám) dostane mapu kontinentu bez červené
+            var highlight = highlighted ? fig.highlights[data.names[countryId]] : fig.plain;
+            if (shownContinent !== continent) {
+                var base = clone(fig.base);
+                Plotly.react(map, base.data, base.layout);
+                shownContinent = continent;
+            }
+            Plotly.restyle(map, {z: [highlight.z]}, [0]);
+            var micro = microTrace(map);
+            if (micro >= 0 && highlight.micro_color.length) {
+                Plotly.restyle(map, {"marker.color": [highlight.micro_color], "marker.size": [highlight.micro_size]}, [micro]);
+            }
+            var geo = {"geo.fitbounds": highlight.geo.fitbounds, "geo.projection.scale": highlight.geo.projection.scale};
+            if (highlight.geo.center) {
+                geo["geo.center.lat"] = highlight.geo.center.lat;
+                geo["geo.center.lon"] = highlight.geo.center.lon;
+            }
+            Plotly.relayout(map, geo);
+        });
+    }
+
+    function resolveClick(event) {
+        // Marker mikro-státu nese ID v customdata, choropleth anglický název v "location"
+        var points = (event && event.points) || [];
+        for (var i = 0; i < points.length; i++) {
+            var id = points[i].customdata;
+            if (typeof id === "number" && id >= 0 && id < data.names.length) {
+                return id;
+            }
+            var found = data.en_names.indexOf(points[i].location);
+            if (found >= 0) {
+                return found;
+            }
+        }
+        return null;
+    }
+
+    ///////////////////////////////////////////////////////////////////////////
+    // LOSOVÁNÍ: ROVNOMĚRNĚ (PROHOZENÍ S POSLEDNÍM) NEBO PODLE VAH
+    ///////////////////////////////////////////////////////////////////////////
+    function draw(pool) {
+        if (!pool.length) {
+            return null;
+        }
+        var i = Math.floor(Math.random() * pool.length);
+        var last = pool.length - 1;
+        var tmp = pool[i];
+        pool[i] = pool[last];
+        pool[last] = tmp;
+        return pool.pop();
+    }
+
+    function drawWeighted(weights) {
+        // weights: ID -> váha; vylosovaná země dostane váhu 0 (desítky zemí -> stačí lineárně)
+        var total = 0;
+        var id;
+        for (id in weights) {
+            total += weights[id];
+        }
+        if (!total) {
+            return null;
+        }
+        var target = Math.random() * total;
+        var chosen = null;
+        for (id in weights) {
+            if (weights[id]) {
+                chosen = id;
+                target -= weights[id];
+                if (target < 0) {
+                    break;
+                }
+            }
+        }
+        weights[chosen] = 0;
+        return Number(chosen);
+    }
+
+    function adaptiveWeights(ids, mode) {
+        // Stejný vzorec jako game_engine.adaptive_weights; chybovost je snímek z exportu
+        var cfg = data.adaptive;
+        var rates = cfg.rates[mode] || {};
+        var weights = {};
+        ids.forEach(function (id) {
+            var counts = rates[id] || [0, 0];
+            var rate = (counts[1] + 1) / (counts[0] + 2);
+            weights[id] = cfg.base + Math.round(cfg.error * rate) + (missed[id] ? cfg.missed : 0);
+        });
+        return weights;
+    }
+
+    function nextQuestion() {
+        return state.weights ? drawWeighted(state.weights) : draw(state.pool);
+    }
+
+    ///////////////////////////////////////////////////////////////////////////
+    // LOGIKA KVÍZU
+    ///////////////////////////////////////////////////////////////////////////
+    function modeOf(name) {
+        return data.modes[name] ? name : data.default_mode;
+    }
+
+    function eligibleIds(continent, mode) {
+        // Režim "capital" jen se zeměmi, které hlavní město v datech mají
+        var ids = data.continents[continent] || data.continents["Alle"];
+        if (data.modes[mode].labels === "capitals") {
+            return ids.filter(function (id) { return data.capitals[id]; });
+        }
+        return ids;
+    }
+
+    function answerText(id) {
+        return data.modes[state.mode].labels === "capitals" ? data.capitals[id] : data.names[id];
+    }
+
+    function elapsedText() {
+        if (!state) {
+            return "0 s";
+        }
+        var end = state.end !== null ? state.end : Date.now();
+        var elapsed = (end - state.start) / 1000;
+        if (elapsed < 120) {
+            return Math.floor(elapsed) + " s";
+        }
+        return Math.floor(elapsed / 60) + " min " + Math.floor(elapsed % 60) + " s";
+    }
+
+    function render() {
+        var ids = data.continents[state.continent] || data.continents["Alle"];
+        var remaining = ids.filter(function (id) { return !state.done[id]; });
+        var done = ids.filter(function (id) { return state.done[id]; });
+        var toNames = function (list) { return list.map(function (id) { return data.names[id]; }).join(", "); };
+        var mode = data.modes[state.mode];
+        var labels = mode.labels === "capitals" ? data.capitals : data.names;
+
+        $("guess-controls").classList.toggle("hidden", mode.input === "click");
+        fillSelect($("country-guess-dropdown"), mode.input === "click" ? [] : remaining.filter(function (id) {
+            return labels[id];
+        }).map(function (id) {
+            return {label: labels[id], value: id};
+        }));
+        if (state.current !== null) {
+            $("question-prompt").textContent = PROMPTS[state.mode].replace("{country}", data.names[state.current]);
+        }
+        $("score-correct").textContent = String(state.correct);
+        $("score-wrong").textContent = String(state.wrong);
+        $("score-time").textContent = elapsedText();
+        $("list-remaining").textContent = remaining.length ? toNames(remaining) : "Keine mehr";
+        $("list-done").textContent = done.length ? toNames(done) : "Noch keine";
+    }
+
+    function showQuestion() {
+        render();
+        drawMap(state.continent, state.current, data.modes[state.mode].highlight);
+    }
+
+    function startQuiz() {
+        var continent = $("continent-dropdown").value || "Alle";
+        var checked = document.querySelector("input[name=mode-select]:checked");
+        var mode = modeOf(checked ? checked.value : null);
+        var ids = eligibleIds(continent, mode);
+        var adaptive = $("adaptive-select").checked;
+        state = {
+            continent: continent,
+            mode: mode,
+            pool: adaptive ? null : ids.slice(),
+            weights: adaptive ? adaptiveWeights(ids, mode) : null,
+            repeated: {},
+            correct: 0,
+            wrong: 0,
+            done: {},
+            start: Date.now(),
+            end: null
+        };
+        // Další otázka se losuje o krok dopředu jako na serveru - chybná země se tak
+        // v adaptivní hře nevrátí hned jako následující
+        state.current = nextQuestion();
+        state.next = nextQuestion();
+        $("guess-result").textContent = "Quiz initialisiert!";
+        showQuestion();
+        showScreen(3);
+    }
+
+    function answer(guessId) {
+        var currentId = state.current;
+        var message;
+        var correct = guessId === currentId;
+        if (correct) {
+            message = "Richtig! Neues Land wurde geladen.";
+            state.correct += 1;
+            delete missed[currentId];
+        } else {
+            message = "Falsch! Richtig war: " + answerText(currentId);
+            state.wrong += 1;
+            missed[currentId] = true;
+        }
+        if (state.weights && !correct && !state.repeated[currentId]) {
+            // Špatně poprvé -> země se jednou vrátí do losování
+            state.weights[currentId] = data.adaptive.repeat;
+            state.repeated[currentId] = true;
+        } else {
+            state.done[currentId] = true;
+        }
+        state.current = state.next !== null ? state.next : nextQuestion();
+        state.next = nextQuestion();
+        if (state.current === null) {
+            message += " Quiz beendet!";
+            state.end = Date.now();
+        }
+        $("guess-result").textContent = message;
+        showQuestion();
+    }
+
+    function submitGuess() {
+        if (!state || state.current === null) {
+            $("guess-result").textContent = "Keine Länder mehr übrig nebo Quiz nicht gestartet.";
+            return;
+        }
+        var value = $("country-guess-dropdown").value;
+        if (value === "") {
+            $("guess-result").textContent = "Bitte wähle ein Land aus dem Dropdown!";
+            return;
+        }
+        answer(Number(value));
+    }
+
+    function clickMap(event) {
+        // Kliknutí do mapy je odpověď jen v režimu, který je tak hraje
+        if (!state || state.current === null || data.modes[state.mode].input !== "click") {
+            return;
+        }
+        var id = resolveClick(event);
+        if (id === null) {
+            $("guess-result").textContent = "Bitte klicke auf ein Land des Quiz!";
+            return;
+        }
+        answer(id);
+    }
+
+    ///////////////////////////////////////////////////////////////////////////
+    // START
+    ///////////////////////////////////////////////////////////////////////////
+    fetchJSON("data/countries.json").then(function (loaded) {
+        data = loaded;
+        fillSelect($("continent-dropdown"), data.dropdown.map(function (c) {
+            return {label: c, value: c};
+        }), "Kontinent auswählen...");
+        drawMap(null, null, false).then(function () {
+            $("blind-map").on("plotly_click", clickMap);
+        });
+
+        $("btn-to-screen-2").addEventListener("click", function () { showScreen(2); });
+        $("btn-to-screen-3").addEventListener("click", startQuiz);
+        $("btn-back-to-screen-2").addEventListener("click", function () { showScreen(2); });
+        $("guess-button").addEventListener("click", submitGuess);
+        setInterval(function () {
+            if (state) {
+                $("score-time").textContent = elapsedText();
+            }
+        }, 1000);
+    });
+})();
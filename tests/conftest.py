@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+# Moduly aplikace leží v kořeni repozitáře (bez balíčku)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from country_data import Dataset, validate  # noqa: E402
+from country_index import CountryIndex  # noqa: E402
+
+ROWS = [
+    {"continent": "Europa", "country_de": "Frankreich", "country_en": "France", "capital_de": "Paris",
+     "lon_min": -5, "lat_min": 42, "lon_max": 8, "lat_max": 51},
+    {"continent": "Europa", "country_de": "Spanien", "country_en": "Spain", "capital_de": "Madrid",
+     "lon_min": -9, "lat_min": 36, "lon_max": 3, "lat_max": 44},
+    {"continent": "Europa", "country_de": "Monaco", "country_en": "Monaco", "capital_de": "",
+     "lat": 43.73, "lon": 7.42, "lon_min": 7.4, "lat_min": 43.7, "lon_max": 7.44, "lat_max": 43.76,
+     "zoom": 40, "micro": "1"},
+    {"continent": "Afrika", "country_de": "Ägypten", "country_en": "Egypt", "capital_de": "Kairo",
+     "lon_min": 25, "lat_min": 22, "lon_max": 37, "lat_max": 32},
+    {"continent": "Afrika", "country_de": "Kenia", "country_en": "Kenya", "capital_de": "Nairobi",
+     "lon_min": 34, "lat_min": -5, "lon_max": 42, "lat_max": 5},
+]
+
+
+@pytest.fixture
+def data():
+    # Malý index nezávislý na data/countries.csv
+    return CountryIndex(Dataset(validate(ROWS), "test", "<tests>"))
@@ -0,0 +1,67 @@
+import random
+from collections import Counter
+
+import game_engine
+from quiz_state import REPEAT_WEIGHT, done_ids, missed_ids, remaining_ids
+
+
+def _play(data, state, rng, accuracy):
+    asked = []
+    while state["current"] is not None:
+        asked.append(state["current"])
+        assert len(asked) <= 2 * len(data.names), "hra nekončí"
+        guess_id = state["current"] if rng.random() < accuracy else -1
+        state, _ = game_engine.submit(state, data, guess_id, rng)
+    return state, asked
+
+
+def test_each_country_at_most_twice_and_game_ends(data):
+    rng = random.Random(5)
+    ids = data.ids_by_continent["Alle"]
+    for accuracy in (0.0, 0.5, 1.0):
+        for _ in range(50):
+            state = game_engine.start(data, "Alle", adaptive=True, now=0.0, rng=rng)
+            state, asked = _play(data, state, rng, accuracy)
+            counts = Counter(asked)
+            assert set(counts) == set(ids)
+            assert max(counts.values()) <= 2
+            assert sorted(done_ids(state)) == sorted(ids)
+            assert state["correct"] + state["wrong"] == len(asked)
+
+
+def test_wrong_answer_returns_country_once(data):
+    rng = random.Random(6)
+    state = game_engine.start(data, "Alle", adaptive=True, now=0.0, rng=rng)
+    first = state["current"]
+    state, result = game_engine.submit(state, data, -1, rng)
+    assert not result["correct"]
+    assert first in remaining_ids(state)
+    assert first not in done_ids(state)
+    assert first in missed_ids(state)
+    assert not result["repeat"]
+    while state["current"] != first:
+        state, result = game_engine.submit(state, data, state["current"], rng)
+        assert not result["repeat"]
+    state, result = game_engine.submit(state, data, first, rng)
+    assert result["repeat"] and result["expected"] == first
+    assert REPEAT_WEIGHT > game_engine.BASE_WEIGHT + game_engine.ERROR_WEIGHT + game_engine.MISSED_WEIGHT
+
+
+def test_missed_countries_carry_over_and_weigh_more(data):
+    rng = random.Random(7)
+    previous = game_engine.start(data, "Europa", now=0.0, rng=rng)
+    missed = previous["current"]
+    previous, _ = game_engine.submit(previous, data, -1, rng)
+    state = game_engine.start(data, "Europa", adaptive=True, now=0.0, rng=rng, previous=previous)
+    assert missed_ids(state) == [missed]
+
+    ids = data.ids_by_continent["Europa"]
+    weights = dict(zip(ids, game_engine.adaptive_weights(data, ids, missed=frozenset([missed]))))
+    assert all(weights[missed] > w for i, w in weights.items() if i != missed)
+
+
+def test_error_rates_raise_weight(data):
+    ids = data.ids_by_continent["Afrika"]
+    hard = data.names[ids[0]]
+    weights = game_engine.adaptive_weights(data, ids, {hard: (100, 90), data.names[ids[1]]: (100, 5)})
+    assert weights[0] > weights[1]
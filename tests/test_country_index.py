@@ -0,0 +1,32 @@
+import csv
+
+import country_index
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(dict.fromkeys(k for row in rows for k in row)))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_get_sees_version_loaded_by_another_worker(tmp_path, monkeypatch):
+    from conftest import ROWS
+
+    path = tmp_path / "countries.csv"
+    _write_csv(path, ROWS[:3])
+    monkeypatch.setattr(country_index, "DATA_PATH", str(path))
+    monkeypatch.setattr(country_index, "RELOAD_INTERVAL", 3600.0)
+    monkeypatch.setattr(country_index, "_versions", type(country_index._versions)())
+    monkeypatch.setattr(country_index, "_current", None)
+    monkeypatch.setattr(country_index, "_stamp", None)
+    monkeypatch.setattr(country_index, "_next_check", 0.0)
+    old = country_index.current()
+
+    # Soubor se změnil; tento proces by ho podle RELOAD_INTERVAL kontroloval až za hodinu
+    _write_csv(path, ROWS)
+    new_version = country_index.load(str(path)).version
+    assert country_index.current() is old
+    assert country_index.get(new_version).version == new_version
+    assert country_index.get(old.version) is old
+    assert country_index.get("unknown") is None
@@ -0,0 +1,80 @@
+import json
+import random
+
+import game_engine
+from quiz_state import dump_state, load_state, remaining_ids
+
+
+def test_start_draws_from_chosen_continent(data):
+    state = game_engine.start(data, "Afrika", now=10.0, rng=random.Random(1))
+    assert {state["current"], state["next"]} == set(data.ids_by_continent["Afrika"])
+    assert state["mode"] == "map"
+    assert state["start"] == 10.0
+    assert game_engine.score(state) == {"correct": 0, "wrong": 0, "accuracy": 0.0}
+
+
+def test_unknown_continent_and_mode_fall_back(data):
+    state = game_engine.start(data, "Atlantis", mode="nonsense", now=0.0, rng=random.Random(2))
+    assert state["mode"] == game_engine.DEFAULT_MODE
+    assert state["current"] in data.ids_by_continent["Alle"]
+
+
+def test_submit_scores_and_finishes(data):
+    rng = random.Random(3)
+    state = game_engine.start(data, "Europa", now=0.0, rng=rng)
+    answered = 0
+    while state["current"] is not None:
+        expected = state["current"]
+        guess_id = expected if answered % 2 == 0 else -1
+        state, result = game_engine.submit(state, data, guess_id, rng)
+        answered += 1
+        assert result["expected"] == expected
+        assert result["correct"] == (guess_id == expected)
+        assert result["expected_text"] == data.names[expected]
+        assert result["finished"] == (state["current"] is None)
+    assert answered == len(data.ids_by_continent["Europa"])
+    assert game_engine.score(state)["correct"] == 2
+    assert game_engine.question(state, data) is None
+    assert game_engine.progress(state, 5.0)["end"] == 5.0
+
+
+def test_capital_mode_skips_countries_without_capital(data):
+    rng = random.Random(4)
+    state = game_engine.start(data, "Europa", mode="capital", now=0.0, rng=rng)
+    asked = []
+    while state["current"] is not None:
+        asked.append(state["current"])
+        state, result = game_engine.submit(state, data, state["current"], rng)
+        assert result["expected_text"] == data.capital_by_de[data.names[asked[-1]]]
+    assert data.id_by_de["Monaco"] not in asked
+    assert len(asked) == 2
+
+
+def test_question_reflects_mode(data):
+    state = game_engine.start(data, "Europa", mode="reverse", now=0.0, rng=random.Random(5))
+    question = game_engine.question(state, data)
+    assert question["highlight"] is False
+    assert question["input"] == "click"
+    assert question["country_de"] == data.names[state["current"]]
+    assert game_engine.progress(state, 0.0)["input"] == "click"
+
+
+def test_simulate_plays_whole_game(data):
+    score = game_engine.simulate(data, "Alle", rng=random.Random(6), accuracy=1.0)
+    assert score == {"correct": len(data.names), "wrong": 0, "accuracy": 1.0}
+
+
+def test_submit_leaves_previous_state_intact_and_state_survives_json(data):
+    # Paměťový session store drží rozbalená pole - dva souběžné tipy nesmí sdílet jejich změny
+    for adaptive in (False, True):
+        rng = random.Random(8)
+        state = game_engine.start(data, "Alle", now=0.0, rng=rng, adaptive=adaptive)
+        before = json.dumps(dump_state(state), sort_keys=True)
+        game_engine.submit(state, data, state["current"], rng)
+        game_engine.submit(state, data, -1, rng)
+        assert json.dumps(dump_state(state), sort_keys=True) == before
+
+        restored = load_state(json.loads(before))
+        assert remaining_ids(restored) == remaining_ids(state)
+        assert game_engine.submit(restored, data, -1, random.Random(9))[0]["next"] == \
+            game_engine.submit(state, data, -1, random.Random(9))[0]["next"]
@@ -0,0 +1,29 @@
+import json
+import math
+
+import geo_assets
+
+
+def _circle(lon, lat, radius, points=400):
+    ring = [[lon + radius * math.cos(2 * math.pi * i / points), lat + radius * math.sin(2 * math.pi * i / points)]
+            for i in range(points)]
+    return {"type": "Polygon", "coordinates": [ring + [ring[0]]]}
+
+
+def test_fine_level_keeps_full_detail_only_for_small_countries(tmp_path):
+    source = tmp_path / "source.geojson"
+    source.write_text(json.dumps({"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {"name": "France"}, "geometry": _circle(2, 46, 4)},
+        {"type": "Feature", "properties": {"name": "Monaco"}, "geometry": _circle(7.42, 43.73, 0.01)},
+    ]}), encoding="utf-8")
+    manifest = geo_assets.build(str(source), str(tmp_path / "geo"))
+    geo_assets.load_manifest.cache_clear()
+
+    def ring_sizes(level):
+        with open(tmp_path / "geo" / manifest["levels"][level], encoding="utf-8") as f:
+            features = json.load(f)["features"]
+        return {feat["properties"]["name"]: len(feat["geometry"]["coordinates"][0]) for feat in features}
+
+    fine, medium = ring_sizes("fine"), ring_sizes("medium")
+    assert fine["France"] == medium["France"] < 401
+    assert fine["Monaco"] == 401
@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+
+from flask import Flask
+
+import http_layer
+
+
+def test_only_static_routes_fill_compression_cache(monkeypatch):
+    monkeypatch.setattr(http_layer, "_compressed_cache", http_layer._LRU(http_layer.ASSET_CACHE_SIZE))
+    server = Flask(__name__)
+    counter = iter(range(1000))
+
+    @server.route("/metrics")
+    def metrics():
+        return f"# {next(counter)}\n" + "quiz_metric 1\n" * 200, 200, {"Content-Type": "text/plain"}
+
+    @server.route("/assets/app.js")
+    def asset():
+        return "var a = 1;\n" * 200, 200, {"Content-Type": "application/javascript"}
+
+    http_layer.install(SimpleNamespace(server=server))
+    client = server.test_client()
+    for _ in range(3):
+        response = client.get("/metrics", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+    assert len(http_layer._compressed_cache._data) == 0
+
+    first = client.get("/assets/app.js", headers={"Accept-Encoding": "gzip"})
+    assert len(http_layer._compressed_cache._data) == 1
+    again = client.get("/assets/app.js", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+import geo_assets
+import map_figures
+
+
+def _square(lon, lat, size):
+    return {"type": "Polygon", "coordinates": [[
+        [lon, lat], [lon + size, lat], [lon + size, lat + size], [lon, lat + size], [lon, lat],
+    ]]}
+
+
+@pytest.fixture
+def geo_manifest(tmp_path, monkeypatch):
+    # Malý lokální GeoJSON: jedna kvízová země a jedna okolní (kontextová stopa)
+    source = tmp_path / "source.geojson"
+    source.write_text(json.dumps({"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {"name": "Egypt"}, "geometry": _square(25, 22, 10)},
+        {"type": "Feature", "properties": {"name": "Libya"}, "geometry": _square(10, 20, 15)},
+    ]}), encoding="utf-8")
+    monkeypatch.setattr(geo_assets, "GEO_DIR", str(tmp_path / "geo"))
+    geo_assets.build(str(source), str(tmp_path / "geo"))
+    for cached in (map_figures._cached_base, map_figures._cached_figure, map_figures._cached_highlight):
+        cached.cache_clear()
+    yield
+    geo_assets.load_manifest.cache_clear()
+    for cached in (map_figures._cached_base, map_figures._cached_figure, map_figures._cached_highlight):
+        cached.cache_clear()
+
+
+def test_figure_without_micro_states_keeps_context_trace(data, geo_manifest):
+    fig = map_figures.get_figure("Ägypten", "Afrika", data)
+    assert [trace.get("meta") for trace in fig["data"][1:]] == [map_figures.CONTEXT_TRACE_META]
+    assert fig["data"][1]["locations"] == ["Libya"]
+    assert fig["data"][0]["z"] == [1, 0]
+    assert fig["data"][0]["hoverinfo"] == "none"
+
+
+def test_figure_with_micro_states_updates_markers(data, geo_manifest):
+    fig = map_figures.get_figure("Monaco", "Europa", data)
+    uids = [trace.get("meta") for trace in fig["data"]]
+    assert uids.index(map_figures.MICRO_TRACE_META) == map_figures.MICRO_TRACE
+    assert uids[-1] == map_figures.CONTEXT_TRACE_META
+    assert fig["data"][map_figures.MICRO_TRACE]["marker"]["color"] == ["red"]
+    assert map_figures.warm_figure_cache(data) > 0
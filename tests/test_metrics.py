@@ -0,0 +1,26 @@
+import json
+import subprocess
+import sys
+from collections import defaultdict
+
+import metrics
+
+
+def test_render_sums_workers_and_keeps_counts_of_dead_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "_directory", str(tmp_path))
+    monkeypatch.setattr(metrics, "_games_started", defaultdict(int))
+    # PID procesu, který už skončil = recyklovaný worker
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    dead = tmp_path / f"worker-{finished.pid}.json"
+    dead.write_text(json.dumps({"games_started": {"Europa": 2}, "duration": {"quiz_logic": [1] + [0] * 10 + [1, 0.5]}}))
+
+    metrics.game_started("Europa")
+    text = metrics.render()
+    assert 'quiz_games_started_total{continent="Europa"} 3' in text
+    assert 'quiz_callback_duration_seconds_count{callback="quiz_logic"} 1' in text
+    assert not dead.exists()
+
+    # Archiv drží čítače mrtvého workeru i po dalších scrapech
+    metrics.game_started("Europa")
+    assert 'quiz_games_started_total{continent="Europa"} 4' in metrics.render()
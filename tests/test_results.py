@@ -0,0 +1,36 @@
+import sqlite3
+
+import results
+
+
+def test_adaptive_games_have_own_leaderboard(tmp_path):
+    store = results.ResultsStore(str(tmp_path / "results.db"), flush_interval=0.01)
+    store.record_game("Europa", "map", "v1", 10, 0, 60.0, finished_at=1.0)
+    store.record_game("Europa", "map", "v1", 12, 3, 90.0, adaptive=True, finished_at=2.0)
+    assert store.flush()
+    assert [row["correct"] for row in store.leaderboard("Europa", "map")] == [10]
+    assert [row["correct"] for row in store.leaderboard("Europa", "map", adaptive=True)] == [12]
+    store.close()
+
+
+def test_database_without_adaptive_column_is_migrated(tmp_path):
+    path = str(tmp_path / "results.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE games (id INTEGER PRIMARY KEY, finished_at REAL NOT NULL, continent TEXT NOT NULL,"
+        " mode TEXT NOT NULL, data_version TEXT, correct INTEGER NOT NULL, wrong INTEGER NOT NULL,"
+        " seconds REAL NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE leaderboard (game_id INTEGER PRIMARY KEY, continent TEXT NOT NULL, mode TEXT NOT NULL,"
+        " finished_at REAL NOT NULL, correct INTEGER NOT NULL, wrong INTEGER NOT NULL, seconds REAL NOT NULL)"
+    )
+    conn.execute("CREATE INDEX leaderboard_rank ON leaderboard (continent, mode, correct DESC, wrong, seconds)")
+    conn.execute("INSERT INTO leaderboard VALUES (1, 'Europa', 'map', 1.0, 7, 1, 50.0)")
+    conn.commit()
+    conn.close()
+
+    store = results.ResultsStore(path, flush_interval=0.01)
+    assert [row["correct"] for row in store.leaderboard("Europa", "map")] == [7]
+    assert store.leaderboard("Europa", "map", adaptive=True) == []
+    store.close()
@@ -0,0 +1,59 @@
+import random
+
+from weighted_pool import FenwickTree, pack_tree, unpack_tree
+
+
+def _brute_find(weights, target):
+    total = 0
+    for pos, weight in enumerate(weights):
+        total += weight
+        if target < total:
+            return pos
+    raise AssertionError("target mimo součet vah")
+
+
+def test_build_matches_weights_and_prefix_sums():
+    rng = random.Random(1)
+    for n in (1, 2, 3, 7, 8, 16, 33):
+        weights = [rng.randrange(0, 50) for _ in range(n)]
+        tree = FenwickTree.build(weights)
+        assert len(tree) == n
+        assert list(tree.weights()) == weights
+        assert tree.total() == sum(weights)
+        assert [tree.prefix(i) for i in range(n + 1)] == [sum(weights[:i]) for i in range(n + 1)]
+
+
+def test_set_and_find_agree_with_brute_force():
+    rng = random.Random(2)
+    weights = [rng.randrange(0, 20) for _ in range(37)]
+    tree = FenwickTree.build(weights)
+    for _ in range(200):
+        pos, weight = rng.randrange(len(weights)), rng.randrange(0, 20)
+        weights[pos] = weight
+        tree.set(pos, weight)
+        assert tree.weight(pos) == weight
+        for target in range(0, sum(weights), 7):
+            assert tree.find(target) == _brute_find(weights, target)
+
+
+def test_sample_skips_zero_weights_and_empty_tree():
+    tree = FenwickTree.build([0, 5, 0, 1])
+    rng = random.Random(3)
+    assert {tree.sample(rng) for _ in range(200)} == {1, 3}
+    tree.set(1, 0)
+    tree.set(3, 0)
+    assert tree.sample(rng) is None
+
+
+def test_sample_is_proportional_to_weight():
+    tree = FenwickTree.build([1, 3, 6])
+    rng = random.Random(4)
+    counts = [0, 0, 0]
+    for _ in range(20000):
+        counts[tree.sample(rng)] += 1
+    assert [round(c / 2000) for c in counts] == [1, 3, 6]
+
+
+def test_pack_roundtrip():
+    tree = FenwickTree.build([4, 0, 9, 2])
+    assert list(unpack_tree(pack_tree(tree)).weights()) == [4, 0, 9, 2]
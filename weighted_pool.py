@@ -0,0 +1,99 @@
+import base64
+from array import array
+
+###############################################################################
+# 1) FENWICKŮV STROM CELOČÍSELNÝCH VAH (losování i změna váhy v O(log n))
+###############################################################################
+# Pozice 0..n-1 odpovídají zemím v pevném pořadí; tree[i] (1-based) drží součet vah
+# úseku končícího na i délky i & -i. Vylosovaná země dostane váhu 0, země k zopakování
+# zase kladnou váhu - strom se nikdy nestaví znovu, jen se upravují cesty k listu.
+class FenwickTree:
+    __slots__ = ("tree",)
+
+    def __init__(self, tree):
+        self.tree = tree                # array("I"), tree[0] se nepoužívá
+
+    @classmethod
+    def build(cls, weights):
+        # Sestavení v O(n): každý uzel přičte svůj součet rodiči
+        tree = array("I", [0])
+        tree.extend(weights)
+        n = len(tree) - 1
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        return cls(tree)
+
+    def copy(self):
+        return FenwickTree(self.tree[:])
+
+    def __len__(self):
+        return len(self.tree) - 1
+
+    def add(self, pos, delta):
+        tree, n = self.tree, len(self.tree) - 1
+        i = pos + 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, pos):
+        # Součet vah na pozicích 0..pos-1
+        total = 0
+        tree = self.tree
+        while pos > 0:
+            total += tree[pos]
+            pos -= pos & -pos
+        return total
+
+    def total(self):
+        return self.prefix(len(self))
+
+    def weight(self, pos):
+        return self.prefix(pos + 1) - self.prefix(pos)
+
+    def set(self, pos, weight):
+        self.add(pos, weight - self.weight(pos))
+
+    def find(self, target):
+        # Nejmenší pozice, kde prefixový součet (včetně ní) přesáhne target - sestup po bitech
+        tree, n = self.tree, len(self.tree) - 1
+        pos = 0
+        step = 1 << (n.bit_length() - 1) if n else 0
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= target:
+                pos = nxt
+                target -= tree[nxt]
+            step >>= 1
+        return pos
+
+    def sample(self, rng):
+        # Náhodná pozice s pravděpodobností úměrnou váze; None = všechny váhy nulové
+        total = self.total()
+        if not total:
+            return None
+        return self.find(rng.randrange(total))
+
+    def weights(self):
+        # Váhy všech pozic v O(n) (opak build) - jen pro zobrazení zbývajících zemí
+        leaves = array("I", self.tree)
+        n = len(leaves) - 1
+        for i in range(n, 0, -1):
+            parent = i + (i & -i)
+            if parent <= n:
+                leaves[parent] -= leaves[i]
+        return leaves[1:]
+
+###############################################################################
+# 2) KÓDOVÁNÍ DO STAVU KVÍZU (base64 jako ostatní pole v quiz_state)
+###############################################################################
+def pack_tree(tree):
+    return base64.b64encode(tree.tree.tobytes()).decode("ascii")
+
+
+def unpack_tree(text):
+    tree = array("I")
+    tree.frombytes(base64.b64decode(text))
+    return FenwickTree(tree)
@@ -0,0 +1,14 @@
+import os
+
+from guess import flask_app
+from map_figures import warm_figure_cache
+
+###############################################################################
+# PRODUKČNÍ WSGI VSTUP (gunicorn wsgi:application)
+###############################################################################
+# S preload_app=True se modul importuje jednou v master procesu ještě před fork(),
+# takže předpočítané figury sdílí všichni workeři (copy-on-write).
+if os.environ.get("QUIZ_PRECOMPUTE_FIGURES", "1") == "1":
+    warm_figure_cache()
+
+application = flask_app